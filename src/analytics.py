@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+
+class Accumulator:
+    """
+    Base class for a metric computed in one streaming pass over an event log.
+    update() is called with every typed row (see eventlog.typed_row) whose
+    event type is in event_types; finish() is called once the pass is done
+    and reports and returns the result.
+    """
+    event_types = ()
+
+    def update(self, row):
+        pass
+
+    def finish(self):
+        return None
+
+
+class AnalyticsEngine:
+    """
+    Feeds one pass over an event log to every registered accumulator. Rows
+    are dispatched by event type and not kept, so memory is whatever state
+    the accumulators hold, however long the log is.
+    """
+    def __init__(self):
+        self.accumulators = []
+        self.by_event_type = defaultdict(list)
+
+    def register(self, accumulator):
+        self.accumulators.append(accumulator)
+        for event_type in accumulator.event_types:
+            self.by_event_type[event_type].append(accumulator)
+        return accumulator
+
+    def run(self, rows):
+        """Streams the rows through the accumulators; returns the number of rows read."""
+        by_event_type = self.by_event_type
+        n_rows = 0
+        for row in rows:
+            n_rows += 1
+            for accumulator in by_event_type.get(row["event_type"], ()):
+                accumulator.update(row)
+        return n_rows
+
+
+def accumulate(accumulator, rows):
+    """Runs a single accumulator over the rows and returns its result."""
+    engine = AnalyticsEngine()
+    engine.register(accumulator)
+    engine.run(rows)
+    return accumulator.finish()
@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+import argparse
+import io
+import multiprocessing
+import os
+import random
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from load_data import load_vertiports, load_transport_times, load_starting_state, load_passenger_demand, build_transport_matrix, load_scenario, compile_scenario
+from models import Passenger, PassengerDemand
+from simulation import Simulation
+from scheduler import RewardScheduler
+from event import Event, PassengerEvent, AircraftFlight
+from eventqueue import HeapEventQueue, EVENT_QUEUES
+from tracing import Tracer
+from eventlog import open_event_log, load_event_columns, read_event_rows, MemoryEventLog, MultiEventLog
+from analytics import AnalyticsEngine
+from data_collector import PassengerLatency, PassengerThroughput, PassengerBookRate, AircraftStatistics, FlightLoad, StrandedPassengers
+from kpi import compute_kpis
+from financial_model import load_log_frame, flight_table
+import pandas as pd
+import heapq
+import numpy as np
+
+
+def linear_transport_time(transport_times, vertiport_name, dest_name):
+    """The old list-scan lookup, kept here as the baseline."""
+    for t in transport_times:
+        if t.src == vertiport_name and t.dest == dest_name:
+            return t.time
+    return None
+
+
+def bench_transport_lookup(data_folder, n_lookups):
+    vertiports = load_vertiports(data_folder + 'vertiport.txt')
+    transports = load_transport_times(data_folder + 'transport_time.csv')
+    matrix = build_transport_matrix(transports, vertiports)
+
+    rng = random.Random(0)
+    pairs = [(rng.choice(matrix.names), rng.choice(matrix.names)) for _ in range(n_lookups)]
+
+    start = time.perf_counter()
+    for src, dest in pairs:
+        linear_transport_time(transports, src, dest)
+    linear_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for src, dest in pairs:
+        matrix.get(src, dest)
+    matrix_elapsed = time.perf_counter() - start
+
+    for src, dest in pairs[:1000]:
+        assert linear_transport_time(transports, src, dest) == matrix.get(src, dest)
+
+    print(f"Transport lookups on {data_folder} ({len(transports)} routes, {n_lookups} lookups)")
+    print(f"  Linear scan : {n_lookups / linear_elapsed:,.0f} lookups/sec")
+    print(f"  OD matrix   : {n_lookups / matrix_elapsed:,.0f} lookups/sec")
+
+
+def list_reward_ranking(scheduler, current_time, vertiport, destination_map):
+    """The old reward_ranking, which walks every waiting passenger, kept here as the baseline."""
+    reward_rank = {}
+    for v in destination_map:
+        total_passengers = len(destination_map[v])
+        highest_latency = max([current_time - p.book_time for p in destination_map[v]])
+        average_latency = sum([current_time - p.book_time for p in destination_map[v]]) / len(destination_map[v])
+        total_passengers_at_vertiport = len(scheduler.simulation.registry.get_vertiport(v).current_passengers)
+        reward_rank[v] = scheduler.reward_value(total_passengers, highest_latency, average_latency, total_passengers_at_vertiport, 0)
+    return sorted(reward_rank.items(), key=lambda x: x[1], reverse=True)
+
+
+def bench_reward_ranking(data_folder, n_calls):
+    vertiports = load_vertiports(data_folder + 'vertiport.txt')
+    aircraft = load_starting_state(data_folder + 'starting_state.txt', 90)
+    transports = load_transport_times(data_folder + 'transport_time.csv')
+    simulation = Simulation(vertiports, aircraft, [], transports, [])
+    scheduler = RewardScheduler(simulation)
+
+    origin = vertiports[0]
+    destinations = [v.name for v in vertiports[1:]]
+    passenger_id = 0
+    print(f"reward_ranking at {origin.name} ({n_calls} calls per queue length)")
+    for queue_length in [10, 100, 1000, 10000]:
+        while len(origin.current_passengers) < queue_length:
+            dest = destinations[passenger_id % len(destinations)]
+            origin.current_passengers.add(Passenger(origin.name, dest, passenger_id, book_time=passenger_id * 0.01))
+            passenger_id += 1
+
+        destination_map = origin.current_passengers.destinations()
+        current_time = passenger_id * 0.01
+
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            list_reward_ranking(scheduler, current_time, origin, destination_map)
+        list_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            scheduler.reward_ranking(current_time, origin, destination_map)
+        stats_elapsed = time.perf_counter() - start
+
+        print(f"  {queue_length:>6} waiting: per-passenger {1e6 * list_elapsed / n_calls:9.1f} us/call, "
+              f"running stats {1e6 * stats_elapsed / n_calls:6.1f} us/call")
+
+
+class ComparedEvent(Event):
+    """An Event ordered by a Python __lt__, as the event queue used to be."""
+    __slots__ = ()
+
+    def __lt__(self, other):
+        return self.time < other.time
+
+
+def bench_event_queue(n_events):
+    rng = random.Random(0)
+    times = [rng.uniform(0, 60 * 24) for _ in range(n_events)]
+
+    events = [ComparedEvent(i, t, "arrival", None) for i, t in enumerate(times)]
+    heap = []
+    start = time.perf_counter()
+    for event in events:
+        heapq.heappush(heap, event)
+    while heap:
+        heapq.heappop(heap)
+    compared_elapsed = time.perf_counter() - start
+
+    events = [Event(i, t, "arrival", None) for i, t in enumerate(times)]
+    queue = HeapEventQueue()
+    start = time.perf_counter()
+    for event in events:
+        queue.push(event)
+    while queue.pop() is not None:
+        pass
+    tuple_elapsed = time.perf_counter() - start
+
+    print(f"Event queue push+pop of {n_events:,} events")
+    print(f"  Event.__lt__ heap : {n_events / compared_elapsed:,.0f} events/sec")
+    print(f"  Tuple-keyed heap  : {n_events / tuple_elapsed:,.0f} events/sec")
+
+
+def run_synthetic_scenario(event_queue, days, n_aircraft, passengers_per_minute):
+    """
+    Hold-model workload shaped like our runs: minute-granularity passenger
+    arrivals booked up front, plus aircraft that alternate 15-90 minute
+    flights and charges until the horizon. Returns the dispatch order.
+    """
+    rng = random.Random(0)
+    horizon = days * 24 * 60
+    event_id = 0
+    for minute in range(horizon):
+        for _ in range(passengers_per_minute):
+            event_queue.push(Event(event_id, float(minute), "add_passenger_to_vertiport", None))
+            event_id += 1
+    for _ in range(n_aircraft):
+        event_queue.push(Event(event_id, rng.uniform(0, 60), "arrival", None))
+        event_id += 1
+
+    order = []
+    while True:
+        event = event_queue.pop()
+        if event is None:
+            break
+        order.append(event.event_id)
+        if event.event_type != "add_passenger_to_vertiport":
+            next_time = event.time + rng.uniform(15, 90)
+            if next_time < horizon:
+                event_queue.push(Event(event_id, next_time, "chargeevent" if event.event_type == "arrival" else "arrival", None))
+                event_id += 1
+    return order
+
+
+def bench_event_backends(days, n_aircraft, passengers_per_minute=5):
+    print(f"Synthetic {days}-day scenario, {n_aircraft} aircraft, {passengers_per_minute} passengers/minute")
+    orders = {}
+    for name, queue_class in EVENT_QUEUES.items():
+        start = time.perf_counter()
+        orders[name] = run_synthetic_scenario(queue_class(), days, n_aircraft, passengers_per_minute)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<9}: {len(orders[name]) / elapsed:,.0f} events/sec ({len(orders[name]):,} events)")
+    first = next(iter(orders.values()))
+    print(f"  Identical dispatch order: {all(order == first for order in orders.values())}")
+
+
+def current_rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def multi_day_simulation(data_folder, days, scheduler_class=RewardScheduler, tracer=None, event_log=None, seed=0):
+    """Loads a scenario and repeats its daily passenger demand for the given number of days."""
+    scenario = load_scenario(data_folder, 90)
+    demands = [PassengerDemand(d.src, d.dest, d.unit_time, d.demand * days) for d in scenario["demands"]]
+
+    simulation = Simulation(scenario["vertiports"], scenario["aircraft"], demands, scenario["transports"], scenario["ground_transports"],
+                            transport_matrix=scenario["transport_matrix"], tracer=tracer, event_log=event_log, seed=seed)
+    simulation.add_scheduler(scheduler_class(simulation))
+    simulation.add_init_aircraft_state()
+    simulation.add_all_passenger_events()
+    return simulation
+
+
+def memory_run(data_folder, days, release):
+    # No log file and no trace output, so only the simulation's own state is measured
+    simulation = multi_day_simulation(data_folder, days, tracer=Tracer("off"), event_log="null")
+    event_processor = simulation.event_processor
+    if not release:
+        # What the event processor used to do: keep every event ever scheduled
+        event_processor.release_event = lambda event: None
+
+    samples = []
+    process_event = event_processor.process_event
+
+    def sampled_process_event(event):
+        day = int(event_processor.current_time // (24 * 60))
+        if day >= len(samples):
+            samples.append((day, len(event_processor.flight_events), current_rss_mb()))
+        process_event(event)
+
+    event_processor.process_event = sampled_process_event
+    loaded_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    event_processor.run(max_event_time=24 * days)
+    run_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"  {'Releasing dispatched events' if release else 'Keeping every event (old behaviour)'}")
+    for day, tracked, rss in samples:
+        print(f"    day {day:>2}: {tracked:>8,} tracked events, RSS {rss:7.1f} MB")
+    print(f"    peak RSS after loading {loaded_peak:.1f} MB, after run {run_peak:.1f} MB")
+
+
+def bench_memory(data_folder, days):
+    print(f"Memory over a {days}-day run of {data_folder}")
+    for release in (False, True):
+        process = multiprocessing.Process(target=memory_run, args=(data_folder, days, release))
+        process.start()
+        process.join()
+
+
+def traced_run(data_folder, days, tracer):
+    """Events/sec of a multi-day run with the given tracer and no event log."""
+    start = time.perf_counter()
+    simulation = multi_day_simulation(data_folder, days, tracer=tracer, event_log="null")
+    simulation.event_processor.run(max_event_time=24 * days)
+    elapsed = time.perf_counter() - start
+    return sum(simulation.event_processor.event_counts.values()) / elapsed
+
+
+def bench_tracing(data_folder, days):
+    """
+    The debug trace written where a default run's stdout goes (a pipe, a
+    terminal or a redirected file) against trace=off. The pipe is drained by
+    cat; line buffering mimics stdout on a terminal.
+    """
+    print(f"Events/sec over a {days}-day run of {data_folder}")
+    for label, line_buffering in [("trace=debug to a pipe", False), ("trace=debug to a line-buffered pipe (tty)", True)]:
+        reader = subprocess.Popen(["cat"], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+        out = io.TextIOWrapper(reader.stdin, line_buffering=line_buffering)
+        try:
+            rate = traced_run(data_folder, days, Tracer("debug", out=out))
+        finally:
+            out.close()
+            reader.wait()
+        print(f"  {label:<42}: {rate:,.0f} events/sec")
+
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, "trace.txt"), "w") as out:
+            rate = traced_run(data_folder, days, Tracer("debug", out=out))
+        print(f"  {'trace=debug to a file':<42}: {rate:,.0f} events/sec")
+
+    print(f"  {'trace=off':<42}: {traced_run(data_folder, days, Tracer('off')):,.0f} events/sec")
+
+
+def bench_log_sinks(data_folder, n_runs):
+    """Many short runs, as in a parameter sweep, with each event log sink."""
+    os.chdir(tempfile.mkdtemp())
+    print(f"{n_runs} one-day runs of {data_folder}")
+    tracer = Tracer("off")
+    for sink in ["csv", "npz", "memory", "null"]:
+        start = time.perf_counter()
+        for run in range(n_runs):
+            simulation = multi_day_simulation(data_folder, 1, tracer=tracer, event_log=sink, seed=run)
+            simulation.event_processor.run(max_event_time=24)
+            simulation.event_processor.close()
+        elapsed = time.perf_counter() - start
+        n_files = len(os.listdir("."))
+        print(f"  {sink:<7}: {n_runs / elapsed:7.1f} runs/sec, {n_files:>5} files in the working directory")
+        for name in os.listdir("."):
+            os.remove(name)
+
+    # One run logged to every sink at once, to check they hold the same columns
+    logs = [open_event_log("csv", "check.csv"), open_event_log("npz", "check.csv"), MemoryEventLog()]
+    simulation = multi_day_simulation(data_folder, 1, tracer=tracer, event_log=MultiEventLog(logs))
+    simulation.event_processor.run(max_event_time=24)
+    simulation.event_processor.close()
+    columns = [load_event_columns(log.path or log) for log in logs]
+    same = all(
+        np.array_equal(columns[0][name], other[name], equal_nan=columns[0][name].dtype.kind == "f")
+        for other in columns[1:] for name in columns[0]
+    )
+    print(f"  CSV, npz and memory logs hold the same columns: {same}")
+
+
+def bench_analytics(data_folder, days):
+    """data_collector's metrics over one multi-day CSV log: a pass per metric vs one shared pass."""
+    os.chdir(tempfile.mkdtemp())
+    simulation = multi_day_simulation(data_folder, days, tracer=Tracer("off"), event_log="csv")
+    simulation.event_processor.run(max_event_time=24 * days)
+    simulation.event_processor.close()
+    path = simulation.event_log.path
+    metrics = [PassengerLatency, PassengerThroughput, PassengerBookRate, AircraftStatistics, FlightLoad, StrandedPassengers]
+
+    def one_pass_each():
+        for metric in metrics:
+            engine = AnalyticsEngine()
+            engine.register(metric())
+            engine.run(read_event_rows(path))
+
+    def single_pass():
+        engine = AnalyticsEngine()
+        for metric in metrics:
+            engine.register(metric())
+        return engine.run(read_event_rows(path))
+
+    n_rows = single_pass()
+    print(f"Analytics over a {days}-day log of {data_folder} ({n_rows:,} rows)")
+    for label, run in [(f"{len(metrics)} passes, one per metric", one_pass_each), ("single streaming pass", single_pass)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        print(f"  {label:<28}: {elapsed:6.2f} s, peak traced memory {peak:6.1f} MB")
+
+
+def bench_kpi(data_folder, days):
+    """Passenger KPIs from the typed columns of one run: streaming accumulators vs the vectorized kpi module."""
+    simulation = multi_day_simulation(data_folder, days, tracer=Tracer("off"), event_log="memory")
+    simulation.event_processor.run(max_event_time=24 * days)
+    columns = simulation.event_log.columns()
+    print(f"Passenger KPIs over a {days}-day run of {data_folder} ({len(columns['time']):,} rows)")
+
+    start = time.perf_counter()
+    engine = AnalyticsEngine()
+    latency = engine.register(PassengerLatency())
+    stranded = engine.register(StrandedPassengers())
+    for metric in [PassengerThroughput, PassengerBookRate]:
+        engine.register(metric())
+    engine.run(read_event_rows(simulation.event_log))
+    streaming_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    kpis = compute_kpis(columns)
+    vectorized_elapsed = time.perf_counter() - start
+
+    same = (kpis["average_latency"], kpis["passengers"]) == (latency.total_latency / latency.N, latency.N) \
+        and kpis["stranded"] == len(stranded.stranded_passengers)
+    print(f"  Streaming accumulators : {streaming_elapsed * 1000:8.1f} ms")
+    print(f"  Vectorized kpi module  : {vectorized_elapsed * 1000:8.1f} ms")
+    print(f"  Same latency and stranded counts: {same}")
+
+
+def iterrows_revenue(log_df, revenue_df):
+    """financial_model's old flight loop: iterrows, split and a revenue_df mask per departure."""
+    total_revenue = 0.0
+    for idx, row in log_df.iterrows():
+        if row["event_type"] == "aircraftdeparture":
+            splitted = row["data"].split()
+            match = revenue_df.loc[(revenue_df["src"] == splitted[1]) & (revenue_df["dest"] == splitted[2])]
+            ticket_price = float(match["ticket_price"].values[0]) if not match.empty else 0.0
+            total_revenue += ticket_price * int(splitted[5])
+    return total_revenue
+
+
+def bench_financial(data_folder, financial_folder, days):
+    os.chdir(tempfile.mkdtemp())
+    simulation = multi_day_simulation(data_folder, days, tracer=Tracer("off"), event_log="csv")
+    simulation.event_processor.run(max_event_time=24 * days)
+    simulation.event_processor.close()
+    log_df = load_log_frame(simulation.event_log.path)
+    revenue_df = pd.read_csv(financial_folder + "revenue.csv")
+    print(f"Flight revenue over a {days}-day log of {data_folder} ({(log_df['event_type'] == 'aircraftdeparture').sum():,} departures)")
+
+    start = time.perf_counter()
+    old_revenue = iterrows_revenue(log_df, revenue_df)
+    iterrows_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flights_df = flight_table(log_df, revenue_df, kwh_rate=0.35, landing_fee_per_flight=2)
+    merge_elapsed = time.perf_counter() - start
+
+    print(f"  iterrows + per-row price lookup : {iterrows_elapsed * 1000:8.1f} ms")
+    print(f"  split + route table merge       : {merge_elapsed * 1000:8.1f} ms")
+    print(f"  Same total revenue: {old_revenue == flights_df['flight_revenue'].sum()}")
+
+
+def seeded_run_columns(data_folder, days, seed):
+    simulation = multi_day_simulation(data_folder, days, tracer=Tracer("off"), event_log="memory", seed=seed)
+    simulation.event_processor.run(max_event_time=24 * days)
+    return simulation.event_log.columns()
+
+
+def same_columns(a, b):
+    return all(np.array_equal(a[name], b[name], equal_nan=a[name].dtype.kind == "f") for name in a)
+
+
+def bench_threaded_runs(data_folder, n_runs, days=1):
+    """Seeded runs one after another vs in a thread pool; each simulation owns its RNG and ID counters."""
+    print(f"{n_runs} seeded {days}-day runs of {data_folder}")
+    seeds = range(n_runs)
+
+    start = time.perf_counter()
+    sequential = [seeded_run_columns(data_folder, days, seed) for seed in seeds]
+    print(f"  sequential  : {n_runs / (time.perf_counter() - start):6.2f} runs/sec")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        threaded = list(pool.map(lambda seed: seeded_run_columns(data_folder, days, seed), seeds))
+    print(f"  4 threads   : {n_runs / (time.perf_counter() - start):6.2f} runs/sec")
+
+    print(f"  Threaded runs reproduce the sequential ones: {all(map(same_columns, sequential, threaded))}")
+    print(f"  Different seeds give different runs: {not same_columns(sequential[0], sequential[1])}")
+
+
+def bench_scenario_load(data_folder, n_loads):
+    """Loading a scenario folder by parsing its files vs from its compiled artifact."""
+    compile_scenario(data_folder)
+    print(f"Loading {data_folder} {n_loads} times")
+    loaded = {}
+    for label, compiled in [("parse the files", False), ("compiled scenario", True)]:
+        start = time.perf_counter()
+        for _ in range(n_loads):
+            loaded[compiled] = load_scenario(data_folder, 90, compiled=compiled)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<18}: {elapsed / n_loads * 1000:8.2f} ms per load")
+
+    parsed, compiled = loaded[False], loaded[True]
+    same = (
+        [(v.id, v.name, v.capacity) for v in parsed["vertiports"]] == [(v.id, v.name, v.capacity) for v in compiled["vertiports"]]
+        and [vars(a) for a in parsed["aircraft"]] == [vars(a) for a in compiled["aircraft"]]
+        and [vars(d) for d in parsed["demands"]] == [vars(d) for d in compiled["demands"]]
+        and np.array_equal(parsed["transport_matrix"].times, compiled["transport_matrix"].times, equal_nan=True)
+        and parsed["transport_matrix"].index == compiled["transport_matrix"].index
+        and parsed["digest"] == compiled["digest"]
+    )
+    print(f"  Same scenario: {same}")
+
+
+def unslotted(cls):
+    """A plain __dict__ class with the same __init__, i.e. the record type before __slots__."""
+    return type("Unslotted" + cls.__name__, (), {"__init__": cls.__init__})
+
+
+def traced_bytes(make, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [make(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Leave out the list holding the records
+    return (after - before - records.__sizeof__()) / n
+
+
+def record_sizes(data_folder):
+    """
+    Traced bytes per passenger (Passenger + PassengerEvent) and per flight
+    (AircraftFlight + its two Events) for the scenario's demand, slotted vs
+    the same classes without __slots__. Returns (n_passengers, n_flights,
+    {record: (unslotted bytes, slotted bytes)}).
+    """
+    demands = load_passenger_demand(data_folder + 'passenger_demand.csv')
+    aircraft = load_starting_state(data_folder + 'starting_state.txt', 90)
+    routes = [(d.src, d.dest) for d in demands for count in d.demand for _ in range(count)]
+    n_passengers = len(routes)
+    n_flights = n_passengers // 4
+
+    def passengers(passenger_class, event_class):
+        def make(i):
+            src, dest = routes[i]
+            passenger = passenger_class(src, dest, i)
+            event = event_class(i, i * 0.5, "add_passenger_to_vertiport", passenger)
+            event.passenger = passenger
+            return event
+        return make
+
+    def flights(flight_class, event_class):
+        def make(i):
+            src, dest = routes[i]
+            flight = flight_class(i, aircraft[i % len(aircraft)], src, dest, i * 0.5, 20.0)
+            return (event_class(2 * i, flight.departure_time, "departure", flight),
+                    event_class(2 * i + 1, flight.arrival_time, "arrival", flight))
+        return make
+
+    # The tuple pairing a flight's two events is not part of the cost
+    pair = tuple.__sizeof__((None, None))
+
+    before_passenger = traced_bytes(passengers(unslotted(Passenger), unslotted(Event)), n_passengers)
+    after_passenger = traced_bytes(passengers(Passenger, PassengerEvent), n_passengers)
+    before_flight = traced_bytes(flights(unslotted(AircraftFlight), unslotted(Event)), n_flights) - pair
+    after_flight = traced_bytes(flights(AircraftFlight, Event), n_flights) - pair
+
+    return n_passengers, n_flights, {
+        "passenger": (before_passenger, after_passenger),
+        "flight": (before_flight, after_flight),
+    }
+
+
+def bench_record_size(data_folder):
+    n_passengers, n_flights, sizes = record_sizes(data_folder)
+    print(f"Record sizes from {data_folder} ({n_passengers:,} passengers, {n_flights:,} flights)")
+    print(f"  Passenger + PassengerEvent : {sizes['passenger'][0]:6.0f} -> {sizes['passenger'][1]:6.0f} bytes")
+    print(f"  AircraftFlight + 2 Events  : {sizes['flight'][0]:6.0f} -> {sizes['flight'][1]:6.0f} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="Scheduling Benchmarks",
+        description="Micro-benchmarks for the simulation hot paths."
+    )
+    parser.add_argument(
+        "benchmark",
+        choices=["transport-lookup", "reward-ranking", "event-queue", "event-backends", "memory", "record-size", "tracing", "log-sinks", "analytics", "kpi", "financial", "threaded-runs", "scenario-load"],
+        help="Which benchmark to run."
+    )
+    parser.add_argument(
+        "--data-folder",
+        type=str,
+        default="../data/large_scale/",
+        help="Path to the folder that contains your data."
+    )
+    parser.add_argument(
+        "-n",
+        type=int,
+        default=None,
+        help="Number of operations to time (each benchmark has its own default)."
+    )
+
+    args = parser.parse_args()
+
+    if args.benchmark == "transport-lookup":
+        bench_transport_lookup(args.data_folder, args.n or 200000)
+    elif args.benchmark == "reward-ranking":
+        bench_reward_ranking(args.data_folder, args.n or 200)
+    elif args.benchmark == "event-queue":
+        bench_event_queue(args.n or 10**6)
+    elif args.benchmark == "event-backends":
+        bench_event_backends(days=3, n_aircraft=args.n or 1000)
+    elif args.benchmark == "memory":
+        bench_memory(os.path.abspath(args.data_folder) + os.sep, days=args.n or 14)
+    elif args.benchmark == "record-size":
+        bench_record_size(args.data_folder)
+    elif args.benchmark == "tracing":
+        bench_tracing(os.path.abspath(args.data_folder) + os.sep, days=args.n or 7)
+    elif args.benchmark == "log-sinks":
+        bench_log_sinks(os.path.abspath(args.data_folder) + os.sep, args.n or 50)
+    elif args.benchmark == "analytics":
+        bench_analytics(os.path.abspath(args.data_folder) + os.sep, days=args.n or 7)
+    elif args.benchmark == "kpi":
+        bench_kpi(args.data_folder, days=args.n or 7)
+    elif args.benchmark == "financial":
+        bench_financial(os.path.abspath(args.data_folder) + os.sep, os.path.abspath("../data/financial") + os.sep, days=args.n or 7)
+    elif args.benchmark == "threaded-runs":
+        bench_threaded_runs(args.data_folder, max(2, args.n or 8))
+    elif args.benchmark == "scenario-load":
+        bench_scenario_load(args.data_folder, args.n or 20)
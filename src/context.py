@@ -0,0 +1,33 @@
+import numpy as np
+
+
+class SimulationContext:
+    """
+    Random state and ID counters owned by one Simulation. Every component
+    draws from `rng` and takes IDs from here instead of module globals, so
+    simulations in the same interpreter (or thread pool) do not interfere
+    and a given seed always reproduces the same run. seed=None seeds from
+    the OS.
+    """
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.flight_id = 0
+        self.passenger_id = 0
+        self.charge_id = 0
+
+    def next_flight_id(self):
+        self.flight_id += 1
+        return self.flight_id
+
+    def next_passenger_id(self):
+        self.passenger_id += 1
+        return self.passenger_id
+
+    def next_charge_id(self):
+        self.charge_id += 1
+        return self.charge_id
+
+    def __str__(self):
+        return (f"SimulationContext(seed={self.seed}, flight_id={self.flight_id}, "
+                f"passenger_id={self.passenger_id}, charge_id={self.charge_id})")
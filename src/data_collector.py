@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import csv, os
+import argparse, collections, math, os
 import matplotlib.pyplot as plt
 import numpy as np
 from enum import Enum
@@ -8,7 +8,12 @@ import plotly.express as px
 import pandas as pd
 
 import matplotlib.pyplot as plt
+from array import array
 from datetime import datetime, timedelta
+from itertools import repeat
+
+from eventlog import latest_log_file, read_event_rows
+from analytics import Accumulator, AnalyticsEngine, accumulate
 
 
 def rounded_down_hour(minute):
@@ -24,49 +29,69 @@ def plot_latencies(latencies):
     plt.show()
 
 
-def plot_latency_histogram(latencies):
-    valid_latencies = [lat for lat in latencies if lat is not None]
+LATENCY_BIN_WIDTH = 10
 
-    if not valid_latencies:
+def plot_latency_histogram(bin_counts, bin_width=LATENCY_BIN_WIDTH):
+    """Plots latency counts per bin, as kept by PassengerLatency (bin index -> count)."""
+    if not bin_counts:
         print("No valid latencies to plot.")
         return
 
-    max_latency = max(valid_latencies)
-    bins = range(0, int(max_latency) + 10, 10)
+    bins = range(0, (max(bin_counts) + 1) * bin_width + 1, bin_width)
+    lefts = [index * bin_width for index in bin_counts]
 
     # Plot the histogram
-    plt.hist(valid_latencies, bins=bins)
+    plt.hist(lefts, bins=bins, weights=list(bin_counts.values()))
     plt.title("Wait Times (Histogram)")
     plt.xlabel("Latency (minutes)")
     plt.ylabel("Frequency")
     plt.show()
 
 
-def calculate_average_latency(reader):
-    N = 0
-    PDepart = {}
-    PBook = {}
-    total_latency = 0.0
-    for row in reader:
-        if row["event_type"] == "passengerdeparture":
-            if row["join_id"] not in PDepart:
-                PDepart[row["join_id"]] = {"time": float(row["time"])}
-        if row["event_type"] == "passengerbook":
-            if row["join_id"] not in PBook:
-                PBook[row["join_id"]] = {"time": float(row["time"])}
-            N += 1
+class PassengerLatency(Accumulator):
+    """
+    Booking to departure wait per passenger; finish() plots them and returns
+    (average latency, N). Only passengers still waiting are kept by id; the
+    histogram is kept as counts per bin, and the per-passenger plot as one
+    float per passenger id.
+    """
+    event_types = ("passengerbook", "passengerdeparture")
 
-    latencies = [None] * N
-    for key in PDepart:
-        if key in PBook:
-            latency = PDepart[key]["time"] - PBook[key]["time"]
-            total_latency += latency 
-            latencies.insert(int(key), latency)
+    def __init__(self):
+        self.N = 0
+        self.book_times = {}  # Booked passengers that have not departed yet
+        self.latencies = array("d")  # Indexed by passenger id, NaN until the passenger departs
+        self.bin_counts = {}  # Latency bin index -> passengers
+        self.total_latency = 0.0
 
-    plot_latencies(latencies)
-    plot_latency_histogram(latencies)
+    def update(self, row):
+        if row["event_type"] == "passengerbook":
+            self.book_times.setdefault(row["join_id"], row["time"])
+            self.N += 1
+        elif row["join_id"] in self.book_times:
+            passenger_id = row["join_id"]
+            latency = row["time"] - self.book_times.pop(passenger_id)
+            self.total_latency += latency
+            latencies = self.latencies
+            if passenger_id >= len(latencies):
+                latencies.extend(repeat(math.nan, passenger_id + 1 - len(latencies)))
+            latencies[passenger_id] = latency
+            index = int(latency // LATENCY_BIN_WIDTH)
+            self.bin_counts[index] = self.bin_counts.get(index, 0) + 1
+
+    def finish(self):
+        N = self.N
+        # Ids can run past N when some passengers are never booked
+        latencies = np.full(max(N, len(self.latencies)), np.nan)
+        latencies[:len(self.latencies)] = self.latencies
+
+        plot_latencies(latencies)
+        plot_latency_histogram(self.bin_counts)
+
+        return self.total_latency / N if N > 0 else 0.0, N
 
-    return total_latency / N if N > 0 else 0.0, N
+def calculate_average_latency(reader):
+    return accumulate(PassengerLatency(), reader)
 
 def plot_throughput_histogram(throughput_per_hour_map, title=""):
     hours = sorted(throughput_per_hour_map.keys())
@@ -79,114 +104,144 @@ def plot_throughput_histogram(throughput_per_hour_map, title=""):
     plt.title(title)
     plt.show()
 
+class HourlyCount(Accumulator):
+    """Events of one type per hour; finish() plots them and returns the average per hour."""
+    title = ""
+
+    def __init__(self):
+        self.per_hour_map = {}
+        self.T = 0.0
+
+    def update(self, row):
+        hour = rounded_down_hour(row["time"])
+        if hour not in self.per_hour_map:
+            self.per_hour_map[hour] = 0
+        self.per_hour_map[hour] += 1
+        self.T = max(self.T, hour)
+
+    def finish(self):
+        plot_throughput_histogram(self.per_hour_map, title=self.title)
+
+        return sum(self.per_hour_map.values()) / self.T
+
+class PassengerThroughput(HourlyCount):
+    event_types = ("passengerarrival",)
+    title = "Passenger Hourly Throughput"
+
+class PassengerBookRate(HourlyCount):
+    event_types = ("passengerbook",)
+    title = "Passenger Booking Rate (Per Hour)"
+
 def calculate_average_throughput(reader):
-    T = 0.0
-    throughput_per_hour_map = {}
-    for row in reader:
-        if row["event_type"] == "passengerarrival":
-            hour = rounded_down_hour(float(row["time"]))
-            if hour not in throughput_per_hour_map:
-                throughput_per_hour_map[hour] = 0
-            throughput_per_hour_map[hour] += 1
-            T = max(T, hour)
-
-    plot_throughput_histogram(throughput_per_hour_map, title="Passenger Hourly Throughput")
-
-    return sum(throughput_per_hour_map.values()) / T 
+    return accumulate(PassengerThroughput(), reader)
     
+class FlightLoad(Accumulator):
+    """Passengers per departing flight, kept as flights per load; finish() prints and plots the distribution."""
+    event_types = ("aircraftdeparture",)
+
+    def __init__(self):
+        self.load_counts = collections.Counter()
+
+    def update(self, row):
+        self.load_counts[row["load"]] += 1
+
+    def finish(self):
+        loads = np.array(list(self.load_counts), dtype=float)
+        counts = np.array(list(self.load_counts.values()), dtype=float)
+        mean = (loads * counts).sum() / counts.sum()
+        print("Mean Flight Capacity: " +  str(mean))
+        print("Std Flight Capacity: " + str(np.sqrt((counts * (loads - mean) ** 2).sum() / counts.sum())))
+
+        n, bins, patches = plt.hist(loads, bins=int(max(self.load_counts)), weights=counts)
+
+        # Add the frequency above each bar
+        for i in range(len(n)):
+            if n[i] > 0:  # Only annotate if there's at least one count in the bin
+                bar_center = (bins[i] + bins[i+1]) / 2
+                bar_height = n[i]
+                plt.text(bar_center, bar_height, str(int(bar_height)),
+                         ha='center', va='bottom')  # ha='center' aligns horizontally
+        plt.title("Flight Load")
+        plt.xlabel("Load")
+        plt.ylabel("Frequency")
+        plt.show()
+
 def average_flight_load(reader):
-    load = []
-    for row in reader:
-        if row["event_type"] == "aircraftdeparture":
-            data = row["data"]
-            load.append(int(data.split(" ")[5]))
-
-    print("Mean Flight Capacity: " +  str(np.mean(load)))
-    print("Std Flight Capacity: " + str(np.std(load)))
-
-    n, bins, patches = plt.hist(load, bins=max(load))
-
-    # Add the frequency above each bar
-    for i in range(len(n)):
-        if n[i] > 0:  # Only annotate if there's at least one count in the bin
-            bar_center = (bins[i] + bins[i+1]) / 2
-            bar_height = n[i]
-            plt.text(bar_center, bar_height, str(int(bar_height)),
-                     ha='center', va='bottom')  # ha='center' aligns horizontally
-    plt.title("Flight Load")
-    plt.xlabel("Load")
-    plt.ylabel("Frequency")
-    plt.show()
+    accumulate(FlightLoad(), reader)
 
-def stranded_passengers(reader):
-    total_passengers = 0
-    stranded_passengers = []
-    filtered_passengers = []
-    filter = 3
-    for row in reader:
+class StrandedPassengers(Accumulator):
+    """Passengers booked but never delivered; finish() prints the counts."""
+    event_types = ("passengerbook", "passengerarrival", "simulation_end")
+
+    def __init__(self, filter=3):
+        self.filter = filter
+        self.total_passengers = 0
+        self.stranded_passengers = {}  # Passenger id -> book time, until the passenger arrives
+        self.filtered_passengers = set()  # Several simulation_end rows can list the same passenger
+
+    def update(self, row):
         if row["event_type"] == "passengerbook":
-            passenger_id = int(row['join_id'])
-            booktime = float(row["time"])
-            stranded_passengers.append((booktime, passenger_id))
-            total_passengers += 1
+            self.stranded_passengers[row["passenger_id"]] = row["time"]
+            self.total_passengers += 1
         elif row["event_type"] == "passengerarrival":
-            passenger_id = int(row['join_id'])
-            for passenger in stranded_passengers:
-                if passenger[1] == passenger_id:
-                    stranded_passengers.remove(passenger)
-                    break
+            self.stranded_passengers.pop(row["passenger_id"], None)
         elif row["event_type"] == "simulation_end":
-            end_time = float(row["data"].split(" ")[0])
-            for passenger in stranded_passengers:
-                if passenger[0] < (end_time - (60*filter)):
-                    filtered_passengers.append(passenger[1])
-    print("Number of Stranded Passengers: " + str(len(stranded_passengers)))
-    if len(stranded_passengers) > 0:
-        print("Percentage of Stranded Passengers: " + str(len(stranded_passengers) / total_passengers * 100) + "%")
-    else: 
-        print("Percentage of Stranded Passengers: 0%")
-    print(f"Number of Standard Passengers (Waiting for longer than {filter} hours): " + str(len(filtered_passengers)))
+            end_time = row["end_time"]
+            for passenger_id, booktime in self.stranded_passengers.items():
+                if booktime < (end_time - (60*self.filter)):
+                    self.filtered_passengers.add(passenger_id)
+
+    def finish(self):
+        stranded_passengers = self.stranded_passengers
+        total_passengers = self.total_passengers
+        filter = self.filter
+        print("Number of Stranded Passengers: " + str(len(stranded_passengers)))
+        if len(stranded_passengers) > 0:
+            print("Percentage of Stranded Passengers: " + str(len(stranded_passengers) / total_passengers * 100) + "%")
+        else: 
+            print("Percentage of Stranded Passengers: 0%")
+        print(f"Number of Standard Passengers (Waiting for longer than {filter} hours): " + str(len(self.filtered_passengers)))
+
+def stranded_passengers(reader):
+    accumulate(StrandedPassengers(), reader)
 
 def passenger_book_rate(reader):
-    T = 0.0
-    passenger_book_rate_per_hour_map = {}
-    for row in reader:
-        if row["event_type"] == "passengerbook":
-            hour = rounded_down_hour(float(row["time"]))
-            if hour not in passenger_book_rate_per_hour_map:
-                passenger_book_rate_per_hour_map[hour] = 0
-            passenger_book_rate_per_hour_map[hour] += 1
-            T = max(T, hour)
+    return accumulate(PassengerBookRate(), reader)
 
-    plot_throughput_histogram(passenger_book_rate_per_hour_map, title="Passenger Booking Rate (Per Hour)")
+class RunningStats:
+    """Count, sum, mean and population std of a stream of values, updated in place (Welford's method)."""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.running_mean = 0.0
+        self.m2 = 0.0
 
-    return sum(passenger_book_rate_per_hour_map.values()) / T 
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.running_mean
+        self.running_mean += delta / self.count
+        self.m2 += delta * (value - self.running_mean)
 
-def get_charge_information(aircraft_map, reader):
-    all_charge_times = []
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
 
-    for row in reader:
-        if row["event_type"] == "chargeevent":
-            data = row["data"]
-            aircraft_id = int(data.split(" ")[0])
-            charge_time = float(data.split(" ")[1])
-            aircraft_map[aircraft_id].setdefault("charge_event", []).append(charge_time)
-            all_charge_times.append(charge_time)
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
 
-    for aircraft_id in aircraft_map:
 
-        total_charge_time = np.sum(aircraft_map[aircraft_id].get("charge_event", 0))
-        mean_charge_time = np.mean(aircraft_map[aircraft_id].get("charge_event", 0))
-        std_charge_time = np.std(aircraft_map[aircraft_id].get("charge_event", 0))
+def get_charge_information(aircraft_map, all_charge_times):
+    for aircraft_id in aircraft_map:
+        charge_times = aircraft_map[aircraft_id].get("charge_event", RunningStats())
 
-        print(f"Total Charge Time For Aircraft {aircraft_id}: {total_charge_time}")
-        print(f"Mean Charge Time For Aircraft {aircraft_id}: {mean_charge_time}")
-        print(f"Std Charge Time For Aircraft {aircraft_id}: {std_charge_time}")
+        print(f"Total Charge Time For Aircraft {aircraft_id}: {charge_times.total if charge_times.count else 0}")
+        print(f"Mean Charge Time For Aircraft {aircraft_id}: {charge_times.mean()}")
+        print(f"Std Charge Time For Aircraft {aircraft_id}: {charge_times.std()}")
 
 
-    total_charge_time = np.sum(all_charge_times)
-    mean_charge_time = np.mean(all_charge_times)
-    std_charge_time = np.std(all_charge_times)
+    total_charge_time = all_charge_times.total
+    mean_charge_time = all_charge_times.mean() if all_charge_times.count else math.nan
+    std_charge_time = all_charge_times.std() if all_charge_times.count else math.nan
 
     print(f"Total Charge Time For All Aircraft: {total_charge_time}")
     print(f"Mean Charge Time For All Aircraft: {mean_charge_time}")
@@ -201,6 +256,9 @@ class AIRCRAFT_STATE(Enum):
     FLIGHT = 1,
     CHARGING = 2
 
+AIRCRAFT_STATES = list(AIRCRAFT_STATE)
+STATE_CODES = {state: code for code, state in enumerate(AIRCRAFT_STATES)}
+
 def compute_state_proportions_per_cycle(aircraft_data):
     timeline = sorted(aircraft_data["timeline"], key=lambda x: x[0])
     
@@ -269,8 +327,6 @@ def compute_state_proportions_per_cycle(aircraft_data):
         "average_proportions": overall_proportions
     }
 
-import collections
-
 def calculate_state_proportions(aircraft_map):
     all_aircraft_total = collections.Counter()
     total_cycles_across_fleet = 0
@@ -332,8 +388,8 @@ def plot_aircraft_gantt(aircraft_map):
                         Start=start_dt,
                         Finish=end_dt,
                         State=start_state,
-                        Departure=aircraft_data["route"][str(aircraft_id) + "/" + str(start_time)][0],
-                        Arrival=aircraft_data["route"][str(aircraft_id) + "/" + str(start_time)][1],
+                        Departure=aircraft_data["route"][start_time][0],
+                        Arrival=aircraft_data["route"][start_time][1],
                     ))
                     route_i += 1
 
@@ -360,26 +416,7 @@ def plot_aircraft_gantt(aircraft_map):
     # Display the figure
     fig.show()
 
-def create_timelines(aircraft_map, reader):
-    for row in reader:
-        if row["event_type"] == "aircraftdeparture":
-            data = row["data"]
-            aircraft_id = int(data.split(" ")[0])
-            departure_loc = data.split(" ")[1]
-            arrival_loc = data.split(" ")[2]
-            aircraft_map[aircraft_id].setdefault("timeline", []).append((float(row["time"]), AIRCRAFT_STATE.FLIGHT))
-            aircraft_map[aircraft_id].setdefault("route", {})[str(aircraft_id) + "/" + str(row["time"])] = (departure_loc, arrival_loc)
-        elif row["event_type"] == "aircraftarrival":
-            data = row["data"]
-            aircraft_id = int(data.split(" ")[0])
-            aircraft_map[aircraft_id].setdefault("timeline", []).append((float(row["time"]), AIRCRAFT_STATE.STATIONARY))
-        elif row["event_type"] == "chargeevent":
-            data = row["data"]
-            aircraft_id = int(data.split(" ")[0])
-            charge_time = float(data.split(" ")[1])
-            aircraft_map[aircraft_id].setdefault("timeline", []).append((float(row["time"]) - charge_time, AIRCRAFT_STATE.CHARGING))
-            aircraft_map[aircraft_id]["timeline"].append((float(row["time"]), AIRCRAFT_STATE.STATIONARY))
-        
+def create_timelines(aircraft_map):
     for aircraft_id in aircraft_map:
         aircraft_map[aircraft_id]["timeline"].sort(key=lambda x: x[0])
         print(f"Timeline for Aircraft {aircraft_id}:")
@@ -390,59 +427,113 @@ def create_timelines(aircraft_map, reader):
     calculate_state_proportions(aircraft_map)
     plot_aircraft_gantt(aircraft_map)
 
-def per_aircraft_statistics(file, reader):
-    aircraft_map = {}
-    for row in reader:
+class AircraftStatistics(Accumulator):
+    """
+    Charge times and state timelines per aircraft; finish() prints and plots
+    them. Charge times are kept as running statistics. The timelines are
+    printed and plotted in full, so they keep every state change, but as
+    packed times, state codes and vertiport indices; finish() unpacks them
+    into the "timeline" and "route" entries of aircraft_map.
+    """
+    event_types = ("aircraftinit", "chargeevent", "aircraftdeparture", "aircraftarrival")
+
+    def __init__(self):
+        self.aircraft_map = {}
+        self.all_charge_times = RunningStats()
+        self.vertiports = {}  # Vertiport name -> index into route_stops
+
+    def update(self, row):
+        aircraft_map = self.aircraft_map
         if row["event_type"] == "aircraftinit":
-            aircraft_map[int(row["join_id"])] = {}
-
-    file.seek(0)
-
-    get_charge_information(aircraft_map, reader)
-    file.seek(0)
-
-    create_timelines(aircraft_map, reader)
-    file.seek(0)
+            aircraft_map[row["aircraft_id"]] = {"times": array("d"), "states": bytearray(), "route_stops": array("i")}
+        elif row["event_type"] == "aircraftdeparture":
+            aircraft = aircraft_map[row["aircraft_id"]]
+            aircraft["times"].append(row["time"])
+            aircraft["states"].append(STATE_CODES[AIRCRAFT_STATE.FLIGHT])
+            for vertiport in (row["src"], row["dest"]):
+                aircraft["route_stops"].append(self.vertiports.setdefault(vertiport, len(self.vertiports)))
+        elif row["event_type"] == "aircraftarrival":
+            aircraft = aircraft_map[row["aircraft_id"]]
+            aircraft["times"].append(row["time"])
+            aircraft["states"].append(STATE_CODES[AIRCRAFT_STATE.STATIONARY])
+        elif row["event_type"] == "chargeevent":
+            aircraft = aircraft_map[row["aircraft_id"]]
+            charge_time = row["charge_time"]
+            aircraft.setdefault("charge_event", RunningStats()).add(charge_time)
+            self.all_charge_times.add(charge_time)
+            aircraft["times"].extend((row["time"] - charge_time, row["time"]))
+            aircraft["states"].extend((STATE_CODES[AIRCRAFT_STATE.CHARGING], STATE_CODES[AIRCRAFT_STATE.STATIONARY]))
+
+    def unpack_timelines(self):
+        """Replaces each aircraft's packed timeline with its (time, state) list and departure time -> (src, dest) routes."""
+        names = list(self.vertiports)
+        for aircraft in self.aircraft_map.values():
+            states = [AIRCRAFT_STATES[code] for code in aircraft.pop("states")]
+            aircraft["timeline"] = list(zip(aircraft.pop("times"), states))
+            stops = iter(names[index] for index in aircraft.pop("route_stops"))
+            aircraft["route"] = {time: (next(stops), next(stops))
+                                 for time, state in aircraft["timeline"] if state == AIRCRAFT_STATE.FLIGHT}
+
+    def finish(self):
+        get_charge_information(self.aircraft_map, self.all_charge_times)
+
+        self.unpack_timelines()
+        create_timelines(self.aircraft_map)
+
+def per_aircraft_statistics(reader):
+    accumulate(AircraftStatistics(), reader)
 
 def parse_csv(filename):
-    with open(filename, mode='r', newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
+    """
+    Prints and plots the statistics of one event log, computed in a single
+    streaming pass. The log can be the CSV, a columnar (.npz/.parquet) log
+    or a MemoryEventLog; rows come with typed fields either way.
+    """
+    engine = AnalyticsEngine()
+    latency = engine.register(PassengerLatency())
+    throughput = engine.register(PassengerThroughput())
+    book_rate = engine.register(PassengerBookRate())
+    aircraft = engine.register(AircraftStatistics())
+    flight_load = engine.register(FlightLoad())
+    stranded = engine.register(StrandedPassengers())
+    engine.run(read_event_rows(filename))
 
-        # Latency
-        average_latency, N = calculate_average_latency(reader)
-        print(f"Average Latency: {average_latency}, Total Number of Passengers: {N}")
-        csvfile.seek(0)
+    # Latency
+    average_latency, N = latency.finish()
+    print(f"Average Latency: {average_latency}, Total Number of Passengers: {N}")
 
-        # Throughput
-        average_throughput = calculate_average_throughput(reader)
-        print(f"Average Throughput: {average_throughput} passengers/hour")
-        csvfile.seek(0)
+    # Throughput
+    average_throughput = throughput.finish()
+    print(f"Average Throughput: {average_throughput} passengers/hour")
 
-        # Passenger Book Rate
-        average_passenger_book_rate = passenger_book_rate(reader)
-        print(f"Passenger Book Rate: {average_passenger_book_rate} passengers/hour")
-        csvfile.seek(0)
+    # Passenger Book Rate
+    average_passenger_book_rate = book_rate.finish()
+    print(f"Passenger Book Rate: {average_passenger_book_rate} passengers/hour")
 
-        per_aircraft_statistics(csvfile, reader)
-        csvfile.seek(0)
+    aircraft.finish()
 
-        average_flight_load(reader)
-        csvfile.seek(0)
+    flight_load.finish()
 
-        stranded_passengers(reader)
-        csvfile.seek(0)
+    stranded.finish()
 
 
-def get_log_file_path():
-    i = 0
-    while True:
-        candidate = f"logged_events_{i}.csv"
-        if not os.path.exists(candidate):
-            return f"logged_events_{i-1}.csv"
-        i += 1
-
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="Data Collector",
+        description="Script to compute statistics from a logged events file."
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="Event log to read (.csv, .npz or .parquet); defaults to the newest logged_events_N log."
+    )
+    args = parser.parse_args()
+
     print("Data Collector")
-    filename = get_log_file_path()
+    try:
+        filename = args.log_file or latest_log_file()
+    except FileNotFoundError as error:
+        parser.error(str(error))
     print(f"Log file path: {filename}")
     parse_csv(filename)
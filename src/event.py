@@ -1,17 +1,16 @@
 from models import Aircraft, PassengerDemand
-from vars_types import generate_charge_id
 
 class Event:
-    def __init__(self, event_id, time, event_type, data):
+    __slots__ = ("time", "event_type", "data", "event_id", "priority", "valid", "queued")
+
+    def __init__(self, event_id, time, event_type, data, priority=0):
         self.time = time  # The scheduled time of the event
         self.event_type = event_type  # 'passenger_request', 'departure', 'arrival', 'delay'
         self.data = data  # Associated object (aircraft, passenger request, etc.)
         self.event_id = event_id
+        self.priority = priority  # Lower runs first among events at the same time
         self.valid = True  # Validity flag for outdated events
-
-    def __lt__(self, other):
-        """Sort events by time in the priority queue."""
-        return self.time < other.time
+        self.queued = False  # Set by the event queue while the event is waiting in it
 
     def __repr__(self):
         return (f"Event(time={self.time}, type={self.event_type}, event_id={self.event_id}, "
@@ -19,14 +18,18 @@ class Event:
     
     
 class PassengerEvent(Event):
-    def __init__(self, event_id, time, event_type, passenger):
+    __slots__ = ("passenger",)
+
+    def __init__(self, event_id, time, event_type, passenger, priority=0):
         self.passenger = passenger
-        super().__init__(event_id, time, event_type, passenger)
+        super().__init__(event_id, time, event_type, passenger, priority)
 
     def get_passenger(self):
         return self.passenger
 
 class AircraftFlight:
+    __slots__ = ("flight_id", "aircraft", "departure_airport", "arrival_airport", "departure_time", "enroute_time", "arrival_time")
+
     def __init__(self, flight_id, aircraft, departure_airport, arrival_airport, departure_time, enroute_time):
         self.flight_id = flight_id
         self.aircraft = aircraft
@@ -42,10 +45,12 @@ class AircraftFlight:
                 f"departure_time={self.departure_time}, enroute_time={self.enroute_time})")
 
 class Charge:
-    def __init__(self, aircraft, charge_time):
+    __slots__ = ("aircraft", "charge_time", "charge_id")
+
+    def __init__(self, aircraft, charge_time, charge_id):
         self.aircraft = aircraft 
         self.charge_time = charge_time 
-        self.charge_id = generate_charge_id()
+        self.charge_id = charge_id
 
     def update_charge(self):
         self.aircraft.update_charge(self.charge_time)
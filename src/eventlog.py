@@ -0,0 +1,384 @@
+import csv
+import math
+import os
+import queue
+import threading
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+LOG_HEADER = ["time", "event_type", "join_id", "data"]
+
+# Fixed schema of the columnar log. Columns an event does not use hold -1
+# (ints), NaN (floats) or "" (strings).
+LOG_COLUMNS = {
+    "time": float,
+    "event_type": str,
+    "join_id": int,
+    "aircraft_id": int,
+    "passenger_id": int,
+    "src": str,
+    "dest": str,
+    "enroute_time": float,
+    "battery": float,
+    "load": int,
+    "charge_time": float,
+    "end_time": float,
+}
+MISSING_VALUES = {int: -1, float: math.nan, str: ""}
+COLUMN_DTYPES = {int: np.int64, float: np.float64, str: np.str_}
+
+# Columns filled by each event type's fields, in the order the handlers record
+# them (and the order of the CSV data column)
+EVENT_FIELDS = {
+    "aircraftinit": ("src",),
+    "passengerbook": ("src", "dest"),
+    "aircraftdeparture": ("aircraft_id", "src", "dest", "enroute_time", "battery", "load"),
+    "passengerdeparture": ("src", "dest", "enroute_time"),
+    "aircraftarrival": ("aircraft_id", "src", "dest", "enroute_time", "battery"),
+    "passengerarrival": ("src", "dest", "enroute_time"),
+    "chargeevent": ("aircraft_id", "charge_time"),
+    "simulation_end": ("end_time",),
+}
+
+# Event types whose join_id is an aircraft or passenger id
+JOIN_ID_COLUMNS = {
+    "aircraftinit": "aircraft_id",
+    "passengerbook": "passenger_id",
+    "passengerdeparture": "passenger_id",
+    "passengerarrival": "passenger_id",
+}
+
+COLUMNAR_FORMATS = {".npz", ".parquet"}
+
+# Extensions of the numbered logged_events_N files; a run can write more than
+# one of them (a columnar copy next to the CSV), so readers prefer them in this order
+LOG_FILE_FORMATS = ["csv", "npz", "parquet"]
+
+
+def log_file_exists(index):
+    """Whether any logged_events_<index> file exists in the current directory."""
+    return any(os.path.exists(f"logged_events_{index}.{extension}") for extension in LOG_FILE_FORMATS)
+
+
+def latest_log_file():
+    """The newest logged_events_N log in the current directory, whichever format it was written in."""
+    index = 0
+    while log_file_exists(index):
+        index += 1
+    if index == 0:
+        raise FileNotFoundError("No logged_events_N log in the current directory; pass --log-file")
+    for extension in LOG_FILE_FORMATS:
+        candidate = f"logged_events_{index - 1}.{extension}"
+        if os.path.exists(candidate):
+            return candidate
+
+
+# Rows converted at a time when streaming a columnar log
+ROW_CHUNK = 65536
+
+
+def typed_row(time, event_type, join_id, fields=()):
+    """Converts one log record into a dict with every LOG_COLUMNS entry."""
+    row = {name: MISSING_VALUES[kind] for name, kind in LOG_COLUMNS.items()}
+    row["time"] = float(time)
+    row["event_type"] = event_type
+    row["join_id"] = int(join_id) if join_id != "" else -1
+    for name, value in zip(EVENT_FIELDS.get(event_type, ()), fields):
+        row[name] = LOG_COLUMNS[name](value)
+    if event_type in JOIN_ID_COLUMNS:
+        row[JOIN_ID_COLUMNS[event_type]] = row["join_id"]
+    return row
+
+
+def rows_to_columns(rows):
+    """Packs typed rows into one NumPy array per LOG_COLUMNS entry."""
+    return {
+        name: np.array([row[name] for row in rows], dtype=COLUMN_DTYPES[kind])
+        for name, kind in LOG_COLUMNS.items()
+    }
+
+
+def records_to_columns(records):
+    """
+    Packs (time, event_type, join_id, fields) records into typed column
+    arrays; the same result as rows_to_columns over typed_row, without
+    building a dict per record.
+    """
+    n = len(records)
+    values = {name: [MISSING_VALUES[kind]] * n for name, kind in LOG_COLUMNS.items()}
+    times, event_types, join_ids = values["time"], values["event_type"], values["join_id"]
+    for i, (time, event_type, join_id, fields) in enumerate(records):
+        times[i] = time
+        event_types[i] = event_type
+        join_ids[i] = join_id if join_id != "" else -1
+        for name, value in zip(EVENT_FIELDS.get(event_type, ()), fields):
+            values[name][i] = value
+        if event_type in JOIN_ID_COLUMNS:
+            values[JOIN_ID_COLUMNS[event_type]][i] = join_ids[i]
+    return {
+        name: np.array(values[name], dtype=COLUMN_DTYPES[kind])
+        for name, kind in LOG_COLUMNS.items()
+    }
+
+
+def is_columnar(path):
+    return os.path.splitext(path)[1] in COLUMNAR_FORMATS
+
+
+def load_event_columns(path):
+    """
+    Reads an event log as a dict of typed column arrays. .npz and .parquet
+    logs are read as stored; a CSV log has its data column parsed once here.
+    `path` can also be a MemoryEventLog, whose arrays are returned directly.
+    """
+    if isinstance(path, MemoryEventLog):
+        return path.columns()
+    extension = os.path.splitext(path)[1]
+    if extension == ".npz":
+        with np.load(path) as columns:
+            return {name: columns[name] for name in LOG_COLUMNS}
+    if extension == ".parquet":
+        if pyarrow is None:
+            raise ImportError("Reading a .parquet event log requires pyarrow")
+        table = pyarrow.parquet.read_table(path)
+        return {name: table.column(name).to_numpy() for name in LOG_COLUMNS}
+    return rows_to_columns(list(read_event_rows(path)))
+
+
+def read_event_rows(path):
+    """
+    Yields the log's events as typed row dicts (see typed_row), from a CSV
+    or columnar log file or a MemoryEventLog.
+    """
+    if isinstance(path, MemoryEventLog):
+        yield from path.rows()
+        return
+    if is_columnar(path):
+        # Convert to Python values a chunk at a time rather than the whole log at once
+        columns = load_event_columns(path)
+        names = list(LOG_COLUMNS)
+        n_rows = len(columns["time"])
+        for start in range(0, n_rows, ROW_CHUNK):
+            chunk = [columns[name][start:start + ROW_CHUNK].tolist() for name in names]
+            for values in zip(*chunk):
+                yield dict(zip(names, values))
+        return
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            data = row["data"]
+            yield typed_row(row["time"], row["event_type"], row["join_id"], data.split(" ") if data else ())
+
+
+class EventLog:
+    """
+    Base class for event log sinks. The event processor calls record() for
+    every logged event, flush() at the end of each run() and close() once
+    the simulation is done. `path` is the file written, or None for sinks
+    that do not touch the disk.
+    """
+    path = None
+
+    def record(self, time, event_type, join_id, fields=()):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullEventLog(EventLog):
+    """Discards every record, for runs whose results are read off the simulation itself."""
+
+
+class MemoryEventLog(EventLog):
+    """
+    Keeps the records in memory with no disk I/O. columns() and rows() give
+    the same typed arrays and rows as a columnar log file, so the analysis
+    code can take the log straight from a finished run.
+    """
+    def __init__(self):
+        self.records = []
+
+    def record(self, time, event_type, join_id, fields=()):
+        self.records.append((time, event_type, join_id, fields))
+
+    def rows(self):
+        for record in self.records:
+            yield typed_row(*record)
+
+    def columns(self):
+        return records_to_columns(self.records)
+
+
+class CsvEventLog(EventLog):
+    """
+    Buffered writer for the logged_events CSV. Handlers hand over typed
+    records (time, event_type, join_id, fields) and the space-separated `data`
+    column is only built when a batch is written, with one writerows call per
+    batch.
+
+    With background=True batches are formatted and written on a worker thread
+    fed through a bounded queue, so a slow disk blocks the simulation only
+    once max_pending_batches are waiting. flush() always waits until
+    everything recorded so far is on disk.
+    """
+    def __init__(self, path, batch_size=4096, background=False, max_pending_batches=8):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(LOG_HEADER)
+
+        self.error = None
+        self.batches = None
+        self.thread = None
+        if background:
+            self.batches = queue.Queue(maxsize=max_pending_batches)
+            self.thread = threading.Thread(target=self.write_batches, name="event-log-writer", daemon=True)
+            self.thread.start()
+
+    def record(self, time, event_type, join_id, fields=()):
+        self.buffer.append((time, event_type, join_id, fields))
+        if len(self.buffer) >= self.batch_size:
+            self.submit()
+
+    def submit(self):
+        """Hands the current buffer to the writer (thread)."""
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        if self.batches is None:
+            self.write_batch(batch)
+        else:
+            self.raise_error()
+            self.batches.put(batch)
+
+    def write_batch(self, batch):
+        self.writer.writerows(
+            [time, event_type, join_id, " ".join(map(str, fields))]
+            for time, event_type, join_id, fields in batch
+        )
+
+    def write_batches(self):
+        while True:
+            batch = self.batches.get()
+            try:
+                if batch is None:
+                    return
+                if self.error is None:
+                    self.write_batch(batch)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.batches.task_done()
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def flush(self):
+        """Writes out every record so far and flushes the file."""
+        self.submit()
+        if self.batches is not None:
+            self.batches.join()
+            self.raise_error()
+        self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            if self.thread is not None:
+                self.batches.put(None)
+                self.thread.join()
+            self.file.close()
+
+
+class ColumnarEventLog(MemoryEventLog):
+    """
+    Event log with one typed column per LOG_COLUMNS entry, written as a .npz
+    of NumPy arrays or, when pyarrow is installed, a .parquet file; the format
+    follows the path's extension. Records are held in memory and the whole
+    file is rewritten on flush, so flush once at the end of a run.
+    """
+    def __init__(self, path):
+        extension = os.path.splitext(path)[1]
+        if extension not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar log format '{extension}', expected one of {sorted(COLUMNAR_FORMATS)}")
+        if extension == ".parquet" and pyarrow is None:
+            raise ImportError("Writing a .parquet event log requires pyarrow")
+        super().__init__()
+        self.path = path
+        self.extension = extension
+        self.written = None
+        self.closed = False
+
+    def flush(self):
+        """Writes every record so far, unless nothing was recorded since the last write."""
+        if self.written == len(self.records):
+            return
+        columns = self.columns()
+        if self.extension == ".npz":
+            with open(self.path, "wb") as file:
+                np.savez(file, **columns)
+        else:
+            pyarrow.parquet.write_table(pyarrow.table(columns), self.path)
+        self.written = len(self.records)
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+
+
+class MultiEventLog(EventLog):
+    """Forwards every record to several logs, e.g. a CSV and a columnar log of the same run."""
+    def __init__(self, logs):
+        self.logs = list(logs)
+        self.path = self.logs[0].path
+
+    def record(self, time, event_type, join_id, fields=()):
+        for log in self.logs:
+            log.record(time, event_type, join_id, fields)
+
+    def flush(self):
+        for log in self.logs:
+            log.flush()
+
+    def close(self):
+        for log in self.logs:
+            log.close()
+
+
+# Sink names accepted by open_event_log (and Simulation's event_log argument)
+EVENT_LOG_SINKS = ["csv", "npz", "parquet", "memory", "null"]
+
+
+def open_event_log(sink="csv", path=None, background=False):
+    """
+    Creates the event log for a sink name. File sinks write to `path`, with
+    its extension replaced by .npz/.parquet for the columnar ones;
+    `background` applies to the CSV writer only.
+    """
+    if sink == "csv":
+        return CsvEventLog(path, background=background)
+    if sink in ("npz", "parquet"):
+        return ColumnarEventLog(os.path.splitext(path)[0] + "." + sink)
+    if sink == "memory":
+        return MemoryEventLog()
+    if sink == "null":
+        return NullEventLog()
+    raise ValueError(f"Unknown event log sink '{sink}', expected one of {EVENT_LOG_SINKS}")
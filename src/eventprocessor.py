@@ -1,21 +1,31 @@
-import heapq
 from models import Aircraft, PassengerDemand, Passenger
 from event import Event, AircraftFlight, PassengerEvent, Charge
 from collections import defaultdict
 from visualzation import build_network_graph, visualize_current_state
-import csv, os
+from registry import EntityRegistry
+from eventqueue import HeapEventQueue
+from eventlog import open_event_log, log_file_exists
+from context import SimulationContext
+import tracing
+import os, sys, time
 
-def get_log_file_path():
+def get_log_file_path(extension="csv"):
+    # The first index free in every log format, so a columnar copy written
+    # next to the CSV (or a later run in another format) cannot overwrite a log
     i = 0
-    while True:
-        candidate = f"logged_events_{i}.csv"
-        if not os.path.exists(candidate):
-            return candidate
+    while log_file_exists(i):
         i += 1
+    return f"logged_events_{i}.{extension}"
 
 class EventProcessor:
-    def __init__(self, vertiports=None, transport_times = None, ground_transport_schedule=None, scheduler=None):
-        self.event_queue = []
+    def __init__(self, vertiports=None, transport_times = None, ground_transport_schedule=None, scheduler=None, registry=None, event_queue=None, tracer=None, event_log=None, context=None):
+        # Any EventQueue backend works; the binary heap is the default
+        if event_queue is None:
+            event_queue = HeapEventQueue()
+        self.event_queue = event_queue
+        if tracer is None:
+            tracer = tracing.tracer
+        self.trace = tracer
         self.flight_events = {}  
         self.current_time = 0 
         self.event_id = 0
@@ -23,13 +33,56 @@ class EventProcessor:
         self.transport_times = transport_times 
         self.ground_transport_schedule = ground_transport_schedule
         self.scheduler = scheduler
-        heapq.heapify(self.event_queue)
+        if registry is None:
+            registry = EntityRegistry(vertiports)
+        self.registry = registry
+        if context is None:
+            context = SimulationContext()
+        self.context = context
+        # Vertiports whose passenger queues changed and aircraft whose state
+        # changed since the scheduler last looked
+        self.dirty_vertiports = set()
+        self.dirty_aircraft = set()
 
-        self.log_file_path = get_log_file_path()
-        self.log_file = open(self.log_file_path, "w", newline="")
-        self.csv_writer = csv.writer(self.log_file)
-        self.csv_writer.writerow(["time", "event_type", "join_id", "data"])
+        # Event type -> handler(data). Per-type dispatch counts and cumulative
+        # handler seconds are kept alongside and can be read after run().
+        self.handlers = {}
+        self.event_counts = defaultdict(int)
+        self.handler_time = defaultdict(float)
+        self.register_handler("add_passenger_to_vertiport", self.handle_add_passenger_to_vertiport)
+        self.register_handler("departure", self.handle_departure)
+        self.register_handler("arrival", self.handle_arrival)
+        self.register_handler("chargeevent", self.handle_charge)
+        self.register_handler("delay", self.handle_delay)
 
+        # A sink name ("csv", "npz", "memory", "null", ...) or an EventLog;
+        # file sinks default to the next free logged_events_N path
+        if event_log is None:
+            event_log = "csv"
+        if isinstance(event_log, str):
+            path = get_log_file_path(event_log) if event_log in ("csv", "npz", "parquet") else None
+            event_log = open_event_log(event_log, path)
+        self.event_log = event_log
+        self.log_file_path = event_log.path
+
+
+    def register_handler(self, event_type, handler):
+        """Routes events of event_type to handler(event.data), replacing any existing handler."""
+        self.handlers[sys.intern(event_type)] = handler
+
+    def print_dispatch_stats(self):
+        total = sum(self.handler_time.values())
+        for event_type, count in sorted(self.event_counts.items(), key=lambda x: self.handler_time[x[0]], reverse=True):
+            seconds = self.handler_time[event_type]
+            share = seconds / total * 100 if total > 0 else 0
+            print(f"{event_type:<28} {count:>9} events {seconds:9.3f} s ({share:5.1f}%)")
+
+    def take_dirty(self):
+        """Returns and clears the (vertiports, aircraft) touched since the last call."""
+        dirty = (self.dirty_vertiports, self.dirty_aircraft)
+        self.dirty_vertiports = set()
+        self.dirty_aircraft = set()
+        return dirty
 
     def get_next_event_id(self):
         event_id = self.event_id
@@ -37,20 +90,34 @@ class EventProcessor:
         return event_id
     
     def add_event(self, event):
-        """Schedules a new event in the priority queue."""
-        heapq.heappush(self.event_queue, event)
+        """
+        Schedules a new event in the priority queue. The event itself is the
+        handle for cancel() and reschedule().
+        """
+        self.event_queue.push(event)
         event_id = event.event_id
         event_type = event.event_type
         
-        # Track the event by flight number
+        # Track pending events by flight number; release_event drops them again
         if event_id not in self.flight_events:
             self.flight_events[event_id] = {}
         self.flight_events[event_id][event_type] = event
+        return event
+
+    def release_event(self, event):
+        """Stops tracking an event once it has been dispatched or cancelled."""
+        events = self.flight_events.get(event.event_id)
+        if events is not None and events.get(event.event_type) is event:
+            del events[event.event_type]
+            if not events:
+                del self.flight_events[event.event_id]
 
     def add_passenger_event(self, passenger_event: PassengerEvent):
         self.add_event(passenger_event)
         passenger_event.get_passenger().book_time = self.current_time
-        print(f"Added Passenger at {passenger_event.get_passenger().src} with arrival at {passenger_event.get_passenger().dest} at time {passenger_event.time} with id {passenger_event.event_id}")
+        if self.trace.debug:
+            self.trace(f"Added Passenger at {passenger_event.get_passenger().src} with arrival at {passenger_event.get_passenger().dest} at time {passenger_event.time} with id {passenger_event.event_id}")
+        return passenger_event
 
 
     def add_aircraft_flight(self, flight: AircraftFlight):
@@ -71,134 +138,182 @@ class EventProcessor:
             flight
         )
         self.add_event(arrival_event)
-        print(f"Scheduled flight {flight.flight_id}: departure at {flight.departure_time} and arrival at {flight.arrival_time}")
+        if self.trace.debug:
+            self.trace(f"Scheduled flight {flight.flight_id}: departure at {flight.departure_time} and arrival at {flight.arrival_time}")
+        return departure_event, arrival_event
 
     def add_charge(self, charge: Charge):
         event = Event(self.get_next_event_id(), self.current_time + charge.charge_time, "chargeevent", charge)
         self.add_event(event)
         charge.aircraft.set_charging(True)
         # print(f" Aircraft {charge.aircraft.id} will charge for {charge.charge_time} minutes.")
+        return event
             
 
-    def modify_event(self, event_id, event_type=None, new_time=None, new_data=None):
-        """Modifies an existing event dynamically before it is processed."""
-        if event_id in self.flight_events and event_type in self.flight_events[event_id]:
-            old_event = self.flight_events[event_id][event_type]
-            old_event.valid = False  # Invalidate old event
+    def cancel(self, handle):
+        """Cancels a pending event by handle. Returns True if it was still pending."""
+        if not handle.valid or not handle.queued:
+            return False
+        self.event_queue.invalidate(handle)
+        self.release_event(handle)
+        return True
 
-            # Create and schedule the updated event
-            updated_event = Event(
-                new_time if new_time is not None else old_event.time,
-                event_type if event_type is not None else old_event.event_type,
-                event_id,
-                new_data if new_data is not None else old_event.data
-            )
+    def reschedule(self, handle, new_time=None, new_data=None):
+        """Replaces a pending event with one at a new time and/or with new data. Returns the new handle, or None."""
+        if not self.cancel(handle):
+            return None
+
+        # Create and schedule the updated event
+        updated_event = Event(
+            handle.event_id,
+            new_time if new_time is not None else handle.time,
+            handle.event_type,
+            new_data if new_data is not None else handle.data,
+            handle.priority
+        )
+        self.add_event(updated_event)
+        if self.trace.debug:
+            self.trace(f"Modified {handle.event_type} for flight {handle.event_id} at time {updated_event.time}")
+        return updated_event
 
-            heapq.heappush(self.event_queue, updated_event)
-            self.flight_events[event_id][event_type] = updated_event
-            print(f"Modified {event_type} for flight {event_id} at time {updated_event.time}")
+    def cancel_event(self, event_id, event_type):
+        """Cancels a pending event by id and type. Returns True if there was one to cancel."""
+        event = self.flight_events.get(event_id, {}).get(event_type)
+        return event is not None and self.cancel(event)
+
+    def modify_event(self, event_id, event_type, new_time=None, new_data=None):
+        """Reschedules a pending event by id and type. Returns the new event, or None."""
+        event = self.flight_events.get(event_id, {}).get(event_type)
+        if event is None:
+            return None
+        return self.reschedule(event, new_time, new_data)
 
     def step(self):
         """Processes the next event in the priority queue."""
         if not self.event_queue:
-            print("Simulation complete. No more scheduled events.")
+            if self.trace.info:
+                self.trace("Simulation complete. No more scheduled events.")
             return None
 
-        next_event = heapq.heappop(self.event_queue)
-
-        # Skip invalidated events
-        while not next_event.valid and self.event_queue:
-            next_event = heapq.heappop(self.event_queue)
-
-        if not next_event.valid:
-            print("No more valid events to process.")
+        # The queue skips invalidated events
+        next_event = self.event_queue.pop()
+        if next_event is None:
+            if self.trace.info:
+                self.trace("No more valid events to process.")
             return None
 
+        self.release_event(next_event)
+
         # Advance simulation time to event time
         self.current_time = next_event.time
         return next_event
 
     def init_aircraft(self, aircraft: Aircraft):
-            print(f" Adding Aircraft {aircraft.id} to vertiport {aircraft.loc}")
-            for v in self.vertiports:
-                if v.name == aircraft.loc:
-                    v.current_aircraft.append(aircraft)
-                    self.csv_writer.writerow([self.current_time, "aircraftinit", aircraft.id, str(aircraft.loc)])
-                    break
+            if self.trace.debug:
+                self.trace(f" Adding Aircraft {aircraft.id} to vertiport {aircraft.loc}")
+            if self.registry.place_aircraft(aircraft, aircraft.loc):
+                self.dirty_aircraft.add(aircraft)
+                self.event_log.record(self.current_time, "aircraftinit", aircraft.id, (aircraft.loc,))
 
 
     def process_event(self, event):
         """Handles events based on their type in the discrete event simulation."""
-        print(f"Time {self.current_time}: Processing {event}")
+        if self.trace.debug:
+            self.trace(f"Time {self.current_time}: Processing {event}")
+
+        event_type = event.event_type
+        self.event_counts[event_type] += 1
+        handler = self.handlers.get(event_type)
+        if handler is None:
+            return
 
-        if event.event_type == "add_passenger_to_vertiport":
-            self.handle_add_passenger_to_vertiport(event.data)
-        elif event.event_type == "departure":
-            self.handle_departure(event.data)
-        elif event.event_type == "arrival":
-            self.handle_arrival(event.data)
-        elif event.event_type == "chargeevent":
-            self.handle_charge(event.data)
+        start = time.perf_counter()
+        handler(event.data)
+        self.handler_time[event_type] += time.perf_counter() - start
 
     def handle_add_passenger_to_vertiport(self, passenger: Passenger):
-        print(f" Adding passenger {passenger.id} to vertiport {passenger.src} with destination {passenger.dest}")
-        self.csv_writer.writerow([self.current_time, "passengerbook", passenger.id, str(passenger.src + " " + passenger.dest)])
-        next(v for v in self.vertiports if v.name == passenger.src).current_passengers.append(passenger)
+        if self.trace.debug:
+            self.trace(f" Adding passenger {passenger.id} to vertiport {passenger.src} with destination {passenger.dest}")
+        self.event_log.record(self.current_time, "passengerbook", passenger.id, (passenger.src, passenger.dest))
+        vertiport = self.registry.get_vertiport(passenger.src)
+        vertiport.current_passengers.add(passenger)
+        self.dirty_vertiports.add(vertiport)
 
     def handle_departure(self, flight: AircraftFlight):
-        print(f" Aircraft {flight.aircraft.id} departing from {flight.departure_airport}")
-        removed = False
-        for vertiport in self.vertiports:
-            if flight.aircraft in vertiport.current_aircraft:
-                self.csv_writer.writerow([self.current_time, "aircraftdeparture", flight.flight_id, str(flight.aircraft.id) + " " + str(flight.departure_airport) + " " + str(flight.arrival_airport) + " " + str(flight.enroute_time) + " " + str(flight.aircraft.bat_per) +  " " + str(len(flight.aircraft.load))])
-                for passenger in flight.aircraft.load:
-                    self.csv_writer.writerow([self.current_time, "passengerdeparture", passenger.id, str(passenger.src) + " " + str(passenger.dest) + " " + str(flight.enroute_time)])
-                vertiport.current_aircraft.remove(flight.aircraft)
-                removed = True
-                print(f"Removed aircraft from {vertiport.name}")
-                break
-
-        if not removed:
-            print("Aircraft not found in any vertiport.")
-            return 
+        if self.trace.debug:
+            self.trace(f" Aircraft {flight.aircraft.id} departing from {flight.departure_airport}")
+        vertiport = self.registry.remove_aircraft(flight.aircraft)
+        if vertiport is None:
+            if self.trace.warn:
+                self.trace("Aircraft not found in any vertiport.")
+            return
+
+        self.event_log.record(self.current_time, "aircraftdeparture", flight.flight_id, (flight.aircraft.id, flight.departure_airport, flight.arrival_airport, flight.enroute_time, flight.aircraft.bat_per, len(flight.aircraft.load)))
+        for passenger in flight.aircraft.load:
+            self.event_log.record(self.current_time, "passengerdeparture", passenger.id, (passenger.src, passenger.dest, flight.enroute_time))
+        if self.trace.debug:
+            self.trace(f"Removed aircraft from {vertiport.name}")
 
     def handle_arrival(self, flight: AircraftFlight):
-        print(f" Aircraft {flight.aircraft.id} arrived at {flight.arrival_airport}")
-        for vertiport in self.vertiports:
-            if vertiport.name == flight.arrival_airport:
-                vertiport.current_aircraft.append(flight.aircraft)
-                print(f"Aircraft added to {vertiport.name}")
-                self.csv_writer.writerow([self.current_time, "aircraftarrival", flight.flight_id, str(flight.aircraft.id) + " " + str(flight.departure_airport) + " " + str(flight.arrival_airport) + " " + str(flight.enroute_time) + " " + str(flight.aircraft.bat_per)])
-                break
+        if self.trace.debug:
+            self.trace(f" Aircraft {flight.aircraft.id} arrived at {flight.arrival_airport}")
+        vertiport = self.registry.place_aircraft(flight.aircraft, flight.arrival_airport)
+        if vertiport is not None:
+            if self.trace.debug:
+                self.trace(f"Aircraft added to {vertiport.name}")
+            self.event_log.record(self.current_time, "aircraftarrival", flight.flight_id, (flight.aircraft.id, flight.departure_airport, flight.arrival_airport, flight.enroute_time, flight.aircraft.bat_per))
     
         for passenger in flight.aircraft.load:
-            self.csv_writer.writerow([self.current_time, "passengerarrival", passenger.id, str(passenger.src) + " " + str(passenger.dest) + " " + str(flight.enroute_time)])
+            self.event_log.record(self.current_time, "passengerarrival", passenger.id, (passenger.src, passenger.dest, flight.enroute_time))
 
         flight.aircraft.remove_passengers()
         flight.aircraft.arrived(flight.enroute_time, flight.arrival_airport)
+        self.dirty_aircraft.add(flight.aircraft)
         
 
     def handle_charge(self, charge: Charge):
         charge.update_charge()
-        self.csv_writer.writerow([self.current_time, "chargeevent", charge.charge_id, str(charge.aircraft.id) + " " + str(charge.charge_time)])
+        self.dirty_aircraft.add(charge.aircraft)
+        self.event_log.record(self.current_time, "chargeevent", charge.charge_id, (charge.aircraft.id, charge.charge_time))
         # print(f" Aircraft {charge.aircraft.id} completed charging for {charge.charge_time} minutes with new range (minutes) of {charge.aircraft.bat_per}")
         
 
     def handle_delay(self, data):
-        print(f" Processing delay: {data}")
+        if self.trace.debug:
+            self.trace(f" Processing delay: {data}")
+
+    def close(self):
+        """Flushes and closes the event log."""
+        self.event_log.close()
+
+    def run(self, step_mode=False, max_event_time=20):
+        """Runs the discrete event simulation for up to max_event_time hours."""
+        try:
+            result = self.run_events(step_mode, max_event_time)
+        except BaseException:
+            # Keep what was logged before a handler raised, without letting a
+            # failing flush replace the handler's exception
+            try:
+                self.event_log.flush()
+            except Exception:
+                pass
+            raise
+        # Make the log on disk complete at the end of a run
+        self.event_log.flush()
+        return result
 
-    def run(self, step_mode=False):
-        """Runs the discrete event simulation."""
+    def run_events(self, step_mode, max_event_time):
+        """run()'s event loop, without the final flush."""
         while self.event_queue:
         
             if step_mode:
                 return self.step()  # Return the event for external algorithm modifications
             else:
                 event = self.step()
-                MAX_EVENT_TIME=20
-                if self.current_time > 60*MAX_EVENT_TIME:
-                    print(f"Simulation time exceeded {MAX_EVENT_TIME} hours. Stopping.")
-                    self.csv_writer.writerow([self.current_time, "simulation_end", "", str(60*MAX_EVENT_TIME)])
+                if self.current_time > 60*max_event_time:
+                    if self.trace.info:
+                        self.trace(f"Simulation time exceeded {max_event_time} hours. Stopping.")
+                    self.event_log.record(self.current_time, "simulation_end", "", (60*max_event_time,))
                     return 0
                 
                 if event:
@@ -0,0 +1,187 @@
+import heapq
+
+
+class EventQueue:
+    """
+    Base class for event queue backends. Events are stored as
+    (time, priority, seq, event) entries; seq makes same-time events come out
+    in the order they were pushed, so every backend produces the same order
+    and runs are reproducible.
+
+    Invalidated events stay queued until popped; once they make up more than
+    compact_threshold of the queue (and there are at least
+    compact_min_invalid of them) the queue is rebuilt without them.
+
+    Subclasses implement push_entry, pop_entry, entries, rebuild and
+    entry_count.
+    """
+    def __init__(self, compact_threshold=0.5, compact_min_invalid=1024):
+        self.seq = 0
+        self.invalid = 0
+        self.compact_threshold = compact_threshold
+        self.compact_min_invalid = compact_min_invalid
+
+    def push(self, event):
+        self.push_entry((event.time, event.priority, self.seq, event))
+        self.seq += 1
+        event.queued = True
+
+    def pop(self):
+        """Removes and returns the next valid event, or None if there are none left."""
+        while True:
+            entry = self.pop_entry()
+            if entry is None:
+                return None
+            event = entry[3]
+            event.queued = False
+            if event.valid:
+                return event
+            self.invalid -= 1
+
+    def invalidate(self, event):
+        """Marks a queued event as cancelled; it is dropped when popped or compacted."""
+        if not event.valid:
+            return
+        event.valid = False
+        if not event.queued:
+            return
+        self.invalid += 1
+        if self.invalid >= self.compact_min_invalid and self.invalid > self.compact_threshold * self.entry_count():
+            self.compact()
+
+    def compact(self):
+        kept = []
+        for entry in self.entries():
+            if entry[3].valid:
+                kept.append(entry)
+            else:
+                entry[3].queued = False
+        self.rebuild(kept)
+        self.invalid = 0
+
+    def __len__(self):
+        return self.entry_count() - self.invalid
+
+
+class HeapEventQueue(EventQueue):
+    """Binary heap backend: O(log n) push and pop. This is the default."""
+    def __init__(self, compact_threshold=0.5, compact_min_invalid=1024):
+        super().__init__(compact_threshold, compact_min_invalid)
+        self.heap = []
+
+    def push_entry(self, entry):
+        heapq.heappush(self.heap, entry)
+
+    def pop_entry(self):
+        if not self.heap:
+            return None
+        return heapq.heappop(self.heap)
+
+    def entries(self):
+        return self.heap
+
+    def rebuild(self, entries):
+        heapq.heapify(entries)
+        self.heap = entries
+
+    def entry_count(self):
+        return len(self.heap)
+
+
+class CalendarEventQueue(EventQueue):
+    """
+    Calendar queue (bucketed timing wheel, Brown 1988). Time is cut into
+    windows of `width` minutes and window k lives in bucket k % len(buckets);
+    each bucket is a small heap. Popping walks the wheel from the current
+    window, so with a bucket width near the typical gap between events both
+    push and pop are amortized O(1). The wheel doubles or halves its bucket
+    count as the queue grows or shrinks and re-estimates the width from the
+    upcoming events.
+
+    Experimental: the bucket bookkeeping is Python code on every push and
+    pop, while the heap backend is a single C heapq call, so on our workloads
+    (benchmark.py event-backends) this runs about 30-40% slower than
+    HeapEventQueue whatever the bucket width. It dispatches in the same order.
+    """
+    def __init__(self, width=1.0, n_buckets=16, compact_threshold=0.5, compact_min_invalid=1024):
+        super().__init__(compact_threshold, compact_min_invalid)
+        self.min_buckets = n_buckets
+        self.width = width
+        self.n_buckets = n_buckets
+        self.buckets = [[] for _ in range(n_buckets)]
+        self.size = 0
+        self.window = 0  # Index of the window being popped from
+
+    def window_of(self, time):
+        return int(time // self.width)
+
+    def push_entry(self, entry):
+        window = int(entry[0] // self.width)
+        heapq.heappush(self.buckets[window % self.n_buckets], entry)
+        self.size += 1
+        if window < self.window:
+            # Pushed into the past; rewind so it is not skipped
+            self.window = window
+        if self.size > 2 * self.n_buckets:
+            self.resize(2 * self.n_buckets)
+
+    def pop_entry(self):
+        if self.size == 0:
+            return None
+        buckets, n, width = self.buckets, self.n_buckets, self.width
+        window = self.window
+        for _ in range(n):
+            bucket = buckets[window % n]
+            if bucket and bucket[0][0] // width <= window:
+                break
+            window += 1
+        else:
+            # Nothing within a full turn of the wheel; jump straight to the earliest event
+            bucket = min((b for b in buckets if b), key=lambda b: b[0])
+            window = int(bucket[0][0] // width)
+        self.window = window
+
+        entry = heapq.heappop(bucket)
+        self.size -= 1
+        if n > self.min_buckets and self.size < n // 2:
+            self.resize(n // 2)
+        return entry
+
+    def resize(self, n_buckets):
+        entries = self.entries()
+        self.width = self.estimate_width(entries)
+        self.n_buckets = n_buckets
+        self.buckets = [[] for _ in range(n_buckets)]
+        self.size = 0
+        self.window = self.window_of(min(entries)[0]) if entries else 0
+        for entry in entries:
+            heapq.heappush(self.buckets[self.window_of(entry[0]) % n_buckets], entry)
+            self.size += 1
+
+    def estimate_width(self, entries, sample=25):
+        """Three times the average gap between the next few events, as Brown suggests."""
+        times = sorted(entry[0] for entry in heapq.nsmallest(sample, entries))
+        if len(times) < 2 or times[-1] == times[0]:
+            return self.width
+        return 3 * (times[-1] - times[0]) / (len(times) - 1)
+
+    def entries(self):
+        return [entry for bucket in self.buckets for entry in bucket]
+
+    def rebuild(self, entries):
+        self.buckets = [[] for _ in range(self.n_buckets)]
+        self.size = 0
+        for entry in entries:
+            heapq.heappush(self.buckets[self.window_of(entry[0]) % self.n_buckets], entry)
+            self.size += 1
+        if entries:
+            self.window = self.window_of(min(entries)[0])
+
+    def entry_count(self):
+        return self.size
+
+
+EVENT_QUEUES = {
+    "heap": HeapEventQueue,
+    "calendar": CalendarEventQueue,
+}
@@ -1,22 +1,96 @@
 import pandas as pd
 import numpy as np
+import matplotlib.pyplot as plt
 import os
 import argparse
-
-def get_log_file_path():
-    i = 0
-    while True:
-        candidate = f"logged_events_{i}.csv"
-        if not os.path.exists(candidate):
-            return f"logged_events_{i-1}.csv"
-        i += 1
-
-
-def main(datafolder):
-    capex_df = pd.read_csv(datafolder + "capex.csv")
-    opex_df = pd.read_csv(datafolder + "opex.csv")
-    revenue_df = pd.read_csv(datafolder + "revenue.csv")
-    log_df = pd.read_csv(get_log_file_path())
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from eventlog import load_event_columns, is_columnar, latest_log_file
+
+# Figures summarized across logs in batch mode, and the percentiles reported
+SUMMARY_METRICS = ["annual_flight_revenue", "operating_costs_before_depr", "ebit", "net_income"]
+SUMMARY_PERCENTILES = [5, 25, 50, 75, 95]
+
+# Sensitivity parameters: (low, high) multipliers drawn from a triangular
+# distribution with mode 1 (the base case). utilization scales the days
+# operated per year.
+SENSITIVITY_PARAMETERS = {
+    "ticket_price": (0.8, 1.2),
+    "energy_cost": (0.7, 1.3),
+    "useful_life": (0.7, 1.3),
+    "maintenance": (0.7, 1.3),
+    "utilization": (0.7, 1.0),
+}
+DISCOUNT_RATE = 0.08
+HORIZON_YEARS = 10
+
+# Placeholder energy model: the simulation tracks battery in flight minutes,
+# so route distance comes from flight time at cruise speed, at 1 kWh per mile
+CRUISE_MILES_PER_MINUTE = 2.0
+KWH_PER_MILE = 1.0
+
+
+def load_log_frame(path):
+    """The raw CSV log (with its data column), or the typed columns of a columnar log."""
+    if is_columnar(path):
+        return pd.DataFrame(load_event_columns(path))
+    return pd.read_csv(path)
+
+
+def departure_table(log_df):
+    """One row per aircraft departure with its typed fields."""
+    departures = log_df[log_df["event_type"] == "aircraftdeparture"]
+    if "data" in departures:
+        # CSV log: split the whole data column at once
+        # (aircraft_id src dest enroute_time battery load)
+        fields = departures["data"].str.split(" ", expand=True)
+        aircraft_id, src, dest = fields[0].astype(int), fields[1], fields[2]
+        flight_time_minutes, passenger_count = fields[3].astype(float), fields[5].astype(int)
+    else:
+        aircraft_id, src, dest = departures["aircraft_id"], departures["src"], departures["dest"]
+        flight_time_minutes, passenger_count = departures["enroute_time"], departures["load"]
+    return pd.DataFrame({
+        "time": departures["time"],
+        "aircraft_id": aircraft_id,
+        "src": src,
+        "dest": dest,
+        "flight_time_minutes": flight_time_minutes,
+        "passenger_count": passenger_count,
+    }).reset_index(drop=True)
+
+
+def route_table(departures_df, revenue_df, kwh_rate, landing_fee_per_flight):
+    """
+    Per-route ticket price, distance, energy and landing fee for every route
+    flown. Routes missing from revenue.csv get a ticket price of 0.
+    """
+    routes = departures_df.groupby(["src", "dest"], as_index=False)["flight_time_minutes"].mean()
+    routes = routes.merge(revenue_df[["src", "dest", "ticket_price"]], on=["src", "dest"], how="left")
+    routes["ticket_price"] = routes["ticket_price"].fillna(0.0).astype(float)
+    routes["distance_miles"] = routes["flight_time_minutes"] * CRUISE_MILES_PER_MINUTE
+    routes["energy_consumed_kwh"] = routes["distance_miles"] * KWH_PER_MILE
+    routes["energy_cost"] = routes["energy_consumed_kwh"] * kwh_rate
+    routes["landing_fee"] = landing_fee_per_flight
+    return routes.drop(columns="flight_time_minutes")
+
+
+def flight_table(log_df, revenue_df, kwh_rate, landing_fee_per_flight):
+    """Flight-level revenue and costs: the departures joined with the route table in one merge."""
+    departures_df = departure_table(log_df)
+    routes = route_table(departures_df, revenue_df, kwh_rate, landing_fee_per_flight)
+    flights_df = departures_df.merge(routes, on=["src", "dest"], how="left")
+    flights_df["flight_revenue"] = flights_df["ticket_price"] * flights_df["passenger_count"]
+    return flights_df
+
+
+def income_statement(log_df, capex_df, opex_df, revenue_df):
+    """
+    Unit economics, daily extrapolation and annual income statement of one
+    log, as a dict of the figures print_income_statement reports.
+    """
+    capex_df = capex_df.copy()
 
     # Depreciation
     capex_df["annual_depreciation"] = capex_df["cost"] / capex_df["useful_life"]
@@ -62,6 +136,8 @@ def main(datafolder):
     flight_ops_annual = opex_dict["flight_operations_salary"][0] * num_flight_ops
     ground_ops_annual = opex_dict["ground_operations_salary"][0] * num_ground_ops
 
+    num_aircraft = (log_df["event_type"] == "aircraftinit").sum()
+
     maintenance_annual = opex_dict["maintenance"][0] * num_aircraft
     insurance_annual   = opex_dict["insurance"][0]   * num_aircraft
 
@@ -70,71 +146,10 @@ def main(datafolder):
 
     tax_rate = opex_dict["taxes"][0]
 
-    # flight data structure: each row is a dictionary:
-    # {
-    #   "time": float,
-    #   "aircraft_id": str,
-    #   "src": str,
-    #   "dest": str,
-    #   "flight_time_minutes": float,
-    #   "distance_miles": float,
-    #   "passenger_count": int,
-    #   "ticket_price": float,
-    #   "flight_revenue": float,
-    #   "energy_consumed_kwh": float,
-    #   "energy_cost": float,
-    #   "landing_fee": float
-    # }
-    flights = []
-
-    def get_ticket_price(src, dest):
-        """
-        Return ticket_price if route is in revenue_df, else None
-        """
-        row = revenue_df.loc[(revenue_df["src"] == src) & (revenue_df["dest"] == dest)]
-        if not row.empty:
-            return float(row["ticket_price"].values[0])
-        else:
-            return 0.0  # fallback if no match
-
-    for idx, row in log_df.iterrows():
-        event_type = row["event_type"]
-        data_str = row["data"]
-        
-        if event_type == "aircraftdeparture":
-            splitted = data_str.split()
-            if len(splitted) == 6:
-                plane_id = splitted[0]
-                src = splitted[1]
-                dest = splitted[2]
-                flight_time_minutes = float(splitted[3])
-                passenger_count = int(splitted[5])
-                
-                # Find ticket price from CSV
-                ticket_price = get_ticket_price(src, dest)
-                
-                # Flight revenue = (ticket_price * passenger_count)
-                flight_revenue = ticket_price * passenger_count
-
-                # Assume 1 kWh per mile (placeholder assumption!)
-                flight_energy_cost  = energy_consumed_kwh * kwh_rate
-                
-                flight_dict = {
-                    "time": row["time"],
-                    "aircraft_id": plane_id,
-                    "src": src,
-                    "dest": dest,
-                    "flight_time_minutes": flight_time_minutes,
-                    "passenger_count": passenger_count,
-                    "ticket_price": ticket_price,
-                    "flight_revenue": flight_revenue,
-                    "energy_cost": flight_energy_cost,
-                    "landing_fee": landing_fee_per_flight
-                }
-                
-                flights.append(flight_dict)
-
-    flights_df = pd.DataFrame(flights)
+    # One row per flight: time, aircraft_id, src, dest, flight_time_minutes,
+    # passenger_count, ticket_price, distance_miles, energy_consumed_kwh,
+    # energy_cost, landing_fee, flight_revenue
+    flights_df = flight_table(log_df, revenue_df, kwh_rate, landing_fee_per_flight)
 
     # Aggregate flight-level statistics
     total_flights        = len(flights_df)
@@ -154,15 +169,6 @@ def main(datafolder):
     revenue_per_flight = total_flight_revenue / total_flights if total_flights > 0 else 0
     revenue_per_passenger = total_flight_revenue / total_passengers if total_passengers > 0 else 0
 
-    print("=== UNIT ECONOMICS ===")
-    print(f"Total Flights: {total_flights}")
-    print(f"Total Passengers: {total_passengers}")
-    print(f"Cost per Flight (energy + landing): ${cost_per_flight:,.2f}")
-    print(f"Cost per Passenger (energy + landing): ${cost_per_passenger:,.2f}")
-    print(f"Revenue per Flight: ${revenue_per_flight:,.2f}")
-    print(f"Revenue per Passenger: ${revenue_per_passenger:,.2f}")
-    print("----------------------------------------------------\n")
-
     # ------------------------------------------------------------------------------
     # 5. DAILY ECONOMICS
     # ------------------------------------------------------------------------------
@@ -184,14 +190,6 @@ def main(datafolder):
     daily_energy_cost = total_energy_cost * scaling_factor
     daily_landing_fees = total_landing_fees * scaling_factor
 
-    print("=== DAILY ECONOMICS (Extrapolated) ===")
-    print(f"Simulation length: {simulation_minutes:.2f} minutes")
-    print(f"Scaling factor to 24h: {scaling_factor:.2f}")
-    print(f"Daily Flight Revenue: ${daily_revenue:,.2f}")
-    print(f"Daily Energy Cost: ${daily_energy_cost:,.2f}")
-    print(f"Daily Landing Fees: ${daily_landing_fees:,.2f}")
-    print("----------------------------------------------------\n")
-
     # ------------------------------------------------------------------------------
     # 6. ANNUAL INCOME STATEMENT (Illustrative)
     # ------------------------------------------------------------------------------
@@ -230,29 +228,263 @@ def main(datafolder):
     taxes_paid = taxable_income * tax_rate
     net_income = ebit - taxes_paid
 
+    return {
+        "num_aircraft": num_aircraft,
+        "days_per_year": days_per_year,
+        "tax_rate": tax_rate,
+        "total_flights": total_flights,
+        "total_passengers": total_passengers,
+        "total_distance": total_distance,
+        "total_energy_kwh": total_energy_kwh,
+        "total_energy_cost": total_energy_cost,
+        "total_landing_fees": total_landing_fees,
+        "total_flight_revenue": total_flight_revenue,
+        "cost_per_flight": cost_per_flight,
+        "cost_per_passenger": cost_per_passenger,
+        "revenue_per_flight": revenue_per_flight,
+        "revenue_per_passenger": revenue_per_passenger,
+        "simulation_minutes": simulation_minutes,
+        "scaling_factor": scaling_factor,
+        "daily_revenue": daily_revenue,
+        "daily_energy_cost": daily_energy_cost,
+        "daily_landing_fees": daily_landing_fees,
+        "annual_flight_revenue": annual_flight_revenue,
+        "operating_costs_before_depr": operating_costs_before_depr,
+        "annual_flight_energy_cost": annual_flight_energy_cost,
+        "annual_landing_fees": annual_landing_fees,
+        "annual_labor_costs": annual_labor_costs,
+        "annual_per_aircraft_costs": annual_per_aircraft_costs,
+        "annual_fixed_overhead": annual_fixed_overhead,
+        "total_depreciation_year": total_depreciation_year,
+        "ebit": ebit,
+        "taxes_paid": taxes_paid,
+        "net_income": net_income,
+    }
+
+
+def print_income_statement(statement):
+    print("=== UNIT ECONOMICS ===")
+    print(f"Total Flights: {statement['total_flights']}")
+    print(f"Total Passengers: {statement['total_passengers']}")
+    print(f"Cost per Flight (energy + landing): ${statement['cost_per_flight']:,.2f}")
+    print(f"Cost per Passenger (energy + landing): ${statement['cost_per_passenger']:,.2f}")
+    print(f"Revenue per Flight: ${statement['revenue_per_flight']:,.2f}")
+    print(f"Revenue per Passenger: ${statement['revenue_per_passenger']:,.2f}")
+    print("----------------------------------------------------\n")
+
+    print("=== DAILY ECONOMICS (Extrapolated) ===")
+    print(f"Simulation length: {statement['simulation_minutes']:.2f} minutes")
+    print(f"Scaling factor to 24h: {statement['scaling_factor']:.2f}")
+    print(f"Daily Flight Revenue: ${statement['daily_revenue']:,.2f}")
+    print(f"Daily Energy Cost: ${statement['daily_energy_cost']:,.2f}")
+    print(f"Daily Landing Fees: ${statement['daily_landing_fees']:,.2f}")
+    print("----------------------------------------------------\n")
+
     print("=== ANNUAL INCOME STATEMENT (Approx) ===")
 
-    print(f"Revenue                       : ${annual_flight_revenue:,.0f}")
-    print(f"Operating Costs (no Depr)     : ${operating_costs_before_depr:,.0f}")
-    print(f"   of which Energy            : ${annual_flight_energy_cost:,.0f}")
-    print(f"   of which Landing Fees      : ${annual_landing_fees:,.0f}")
-    print(f"   of which Labor (Pilots, Ops): ${annual_labor_costs:,.0f}")
-    print(f"   of which Maintenance+Insur : ${annual_per_aircraft_costs:,.0f}")
-    print(f"   of which Overhead (G&A,etc): ${annual_fixed_overhead:,.0f}")
-    print(f"Depreciation                  : ${total_depreciation_year:,.0f}")
+    print(f"Revenue                       : ${statement['annual_flight_revenue']:,.0f}")
+    print(f"Operating Costs (no Depr)     : ${statement['operating_costs_before_depr']:,.0f}")
+    print(f"   of which Energy            : ${statement['annual_flight_energy_cost']:,.0f}")
+    print(f"   of which Landing Fees      : ${statement['annual_landing_fees']:,.0f}")
+    print(f"   of which Labor (Pilots, Ops): ${statement['annual_labor_costs']:,.0f}")
+    print(f"   of which Maintenance+Insur : ${statement['annual_per_aircraft_costs']:,.0f}")
+    print(f"   of which Overhead (G&A,etc): ${statement['annual_fixed_overhead']:,.0f}")
+    print(f"Depreciation                  : ${statement['total_depreciation_year']:,.0f}")
 
-    ebit_str = f"${ebit:,.0f}"
+    ebit_str = f"${statement['ebit']:,.0f}"
     print(f"EBIT                          : {ebit_str}")
 
-    taxes_str = f"${taxes_paid:,.0f}"
+    taxes_str = f"${statement['taxes_paid']:,.0f}"
     print(f"Taxes                         : {taxes_str}")
 
-    net_income_str = f"${net_income:,.0f}"
+    net_income_str = f"${statement['net_income']:,.0f}"
     print(f"Net Income                    : {net_income_str}")
 
     print("----------------------------------------------------")
 
 
+def main(datafolder, log_file=None):
+    capex_df = pd.read_csv(datafolder + "capex.csv")
+    opex_df = pd.read_csv(datafolder + "opex.csv")
+    revenue_df = pd.read_csv(datafolder + "revenue.csv")
+    log_df = load_log_frame(log_file or latest_log_file())
+
+    print_income_statement(income_statement(log_df, capex_df, opex_df, revenue_df))
+
+
+def vectorized_statements(statement, capex_df, opex_df, multipliers,
+                          discount_rate=DISCOUNT_RATE, horizon_years=HORIZON_YEARS):
+    """
+    The annual income statement for many parameter sets at once. `statement`
+    is income_statement's base case; `multipliers` maps each
+    SENSITIVITY_PARAMETERS name to an array with one entry per parameter set
+    (missing names stay at 1). Returns arrays of revenue, operating costs,
+    depreciation, EBIT, net income and NPV.
+
+    NPV discounts net income plus depreciation over horizon_years against
+    the capex spent up front, ignoring asset replacement.
+    """
+    n = len(next(iter(multipliers.values())))
+    m = {name: np.asarray(multipliers.get(name, np.ones(n)), dtype=float) for name in SENSITIVITY_PARAMETERS}
+    opex = dict(zip(opex_df["item"], opex_df["cost"]))
+
+    days = statement["days_per_year"] * m["utilization"]
+    revenue = statement["daily_revenue"] * m["ticket_price"] * days
+    energy = statement["daily_energy_cost"] * m["energy_cost"] * days
+    landing = statement["daily_landing_fees"] * days
+    per_aircraft = (opex["maintenance"] * m["maintenance"] + opex["insurance"]) * statement["num_aircraft"]
+    operating_costs = energy + landing + statement["annual_labor_costs"] + per_aircraft + statement["annual_fixed_overhead"]
+
+    cost = capex_df["cost"].to_numpy(dtype=float)
+    useful_life = capex_df["useful_life"].to_numpy(dtype=float)
+    depreciation = (cost / (useful_life * m["useful_life"][:, np.newaxis])).sum(axis=1)
+
+    ebit = revenue - operating_costs - depreciation
+    taxes = np.maximum(ebit, 0) * statement["tax_rate"]
+    net_income = ebit - taxes
+
+    annuity = ((1 + discount_rate) ** -np.arange(1, horizon_years + 1)).sum()
+    npv = (net_income + depreciation) * annuity - cost.sum()
+    return {
+        "annual_flight_revenue": revenue,
+        "operating_costs_before_depr": operating_costs,
+        "depreciation": depreciation,
+        "ebit": ebit,
+        "net_income": net_income,
+        "npv": npv,
+    }
+
+
+def sensitivity_analysis(statement, capex_df, opex_df, n_draws=10000, seed=0, parameters=SENSITIVITY_PARAMETERS):
+    """
+    Monte Carlo over the parameter multipliers plus a one-at-a-time tornado.
+    Returns (tornado, distribution, draws): tornado has EBIT and NPV with
+    each parameter at its low and high end, sorted by NPV swing;
+    distribution has percentiles of EBIT, net income and NPV over the draws.
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = {name: rng.triangular(low, 1.0, high, n_draws) for name, (low, high) in parameters.items()}
+    draws = vectorized_statements(statement, capex_df, opex_df, multipliers)
+
+    # Row 2i holds parameter i at its low end, row 2i+1 at its high end
+    names = list(parameters)
+    one_at_a_time = {name: np.ones(2 * len(names)) for name in names}
+    for i, name in enumerate(names):
+        one_at_a_time[name][2 * i:2 * i + 2] = parameters[name]
+    ends = vectorized_statements(statement, capex_df, opex_df, one_at_a_time)
+    tornado = pd.DataFrame({
+        "parameter": names,
+        "low": [parameters[name][0] for name in names],
+        "high": [parameters[name][1] for name in names],
+        "ebit_low": ends["ebit"][0::2],
+        "ebit_high": ends["ebit"][1::2],
+        "npv_low": ends["npv"][0::2],
+        "npv_high": ends["npv"][1::2],
+    })
+    tornado["npv_swing"] = (tornado["npv_high"] - tornado["npv_low"]).abs()
+    tornado = tornado.sort_values("npv_swing", ascending=False).reset_index(drop=True)
+
+    distribution = pd.DataFrame({
+        metric: np.percentile(draws[metric], SUMMARY_PERCENTILES)
+        for metric in ["ebit", "net_income", "npv"]
+    }, index=[f"p{p}" for p in SUMMARY_PERCENTILES]).T
+    distribution.insert(0, "mean", [draws[metric].mean() for metric in distribution.index])
+    return tornado, distribution, draws
+
+
+def plot_tornado(tornado, base_npv):
+    plt.figure(figsize=(10, 5))
+    rows = tornado.iloc[::-1]
+    low = rows[["npv_low", "npv_high"]].min(axis=1)
+    high = rows[["npv_low", "npv_high"]].max(axis=1)
+    plt.barh(rows["parameter"], high - low, left=low, color="b")
+    plt.axvline(base_npv, color="k", linestyle="--")
+    plt.xlabel(f"NPV ({HORIZON_YEARS} years, {DISCOUNT_RATE:.0%})")
+    plt.title("NPV Sensitivity (Tornado)")
+    plt.show()
+
+
+def plot_distributions(draws):
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    for ax, metric, title in [(axes[0], "ebit", "EBIT"), (axes[1], "npv", "NPV")]:
+        ax.hist(draws[metric], bins=50)
+        ax.set_title(f"{title} Distribution")
+        ax.set_xlabel("Dollars")
+        ax.set_ylabel("Frequency")
+    plt.show()
+
+
+def sensitivity_main(datafolder, log_file, n_draws, seed=0):
+    capex_df = pd.read_csv(datafolder + "capex.csv")
+    opex_df = pd.read_csv(datafolder + "opex.csv")
+    revenue_df = pd.read_csv(datafolder + "revenue.csv")
+    log_df = load_log_frame(log_file or latest_log_file())
+    statement = income_statement(log_df, capex_df, opex_df, revenue_df)
+
+    start = time.perf_counter()
+    tornado, distribution, draws = sensitivity_analysis(statement, capex_df, opex_df, n_draws, seed)
+    elapsed = time.perf_counter() - start
+    base_npv = vectorized_statements(statement, capex_df, opex_df, {"ticket_price": np.ones(1)})["npv"][0]
+
+    money = lambda x: f"{x:,.0f}"
+    print(f"=== SENSITIVITY ({n_draws:,} draws in {elapsed:.2f} s) ===")
+    print(f"Base EBIT: ${statement['ebit']:,.0f}, Base NPV: ${base_npv:,.0f}")
+    print(tornado.to_string(index=False, formatters={c: money for c in tornado.columns if c.startswith(("ebit", "npv"))}))
+    print()
+    print(distribution.to_string(float_format=money))
+    print("----------------------------------------------------")
+
+    plot_tornado(tornado, base_npv)
+    plot_distributions(draws)
+
+
+def evaluate_log(log, datafolder):
+    """
+    Income statement of one log without printing it. `log` is a log file
+    path or typed columns such as MemoryEventLog.columns() of a finished run.
+    """
+    capex_df = pd.read_csv(datafolder + "capex.csv")
+    opex_df = pd.read_csv(datafolder + "opex.csv")
+    revenue_df = pd.read_csv(datafolder + "revenue.csv")
+    log_df = pd.DataFrame(log) if isinstance(log, dict) else load_log_frame(log)
+    return income_statement(log_df, capex_df, opex_df, revenue_df)
+
+
+def evaluate_logs(logs, datafolder, workers=None):
+    """Income statements of many logs (e.g. replications or scheduler variants), one process per log at a time."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate_log, logs, repeat(datafolder)))
+
+
+def summarize_statements(statements, metrics=SUMMARY_METRICS, percentiles=SUMMARY_PERCENTILES):
+    """One row per metric with its mean, spread and percentiles across the statements."""
+    values = pd.DataFrame(statements)[metrics].astype(float)
+    summary = pd.DataFrame({
+        "count": values.count(),
+        "mean": values.mean(),
+        "std": values.std(),
+        "min": values.min(),
+    })
+    for p in percentiles:
+        summary[f"p{p}"] = values.quantile(p / 100)
+    summary["max"] = values.max()
+    summary.index.name = "metric"
+    return summary
+
+
+def batch_main(datafolder, log_files, summary_file, workers=None):
+    statements = evaluate_logs(log_files, datafolder, workers)
+    per_log = pd.DataFrame(statements)[SUMMARY_METRICS]
+    per_log.insert(0, "log_file", log_files)
+    print(per_log.to_string(index=False, float_format=lambda x: f"{x:,.0f}"))
+
+    summary = summarize_statements(statements)
+    summary.to_csv(summary_file)
+    print(f"\n=== SUMMARY OVER {len(log_files)} LOGS ===")
+    print(summary.to_string(float_format=lambda x: f"{x:,.0f}"))
+    print(f"Summary written to {summary_file}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         prog="Dynamic Scheduling Simulation",
@@ -265,10 +497,58 @@ if __name__ == "__main__":
         default="../data/example_1/",
         help="Path to the folder that contains your data."
     )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="Event log to read (.csv, .npz or .parquet); defaults to the newest logged_events_N log."
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Evaluate several event logs in parallel and summarize revenue, EBIT and net income across them."
+    )
+    parser.add_argument(
+        "--summary-file",
+        type=str,
+        default="financial_summary.csv",
+        help="Where --batch writes its summary table."
+    )
+    parser.add_argument(
+        "--sensitivity",
+        type=int,
+        default=None,
+        metavar="DRAWS",
+        help="Monte Carlo sensitivity of the income statement over this many parameter draws."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for --sensitivity."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (defaults to the number of CPUs)."
+    )
 
     # Parse the arguments from the command line
     args = parser.parse_args()
 
     data_folder = args.data_folder
     print(f"Data folder location: {data_folder}")
-    main(data_folder)
+    if not (args.batch or args.log_file):
+        try:
+            args.log_file = latest_log_file()
+        except FileNotFoundError as error:
+            parser.error(str(error))
+    if args.batch:
+        batch_main(data_folder, args.batch, args.summary_file, args.workers)
+    elif args.sensitivity:
+        sensitivity_main(data_folder, args.log_file, args.sensitivity, args.seed)
+    else:
+        main(data_folder, args.log_file)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+import argparse
+
+import numpy as np
+
+from eventlog import load_event_columns
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+
+def passenger_latencies(columns):
+    """
+    Joins every passenger's booking and first departure by passenger id.
+    Returns (passenger ids, latencies), both in departure order.
+    """
+    event_type = columns["event_type"]
+    book = event_type == "passengerbook"
+    depart = event_type == "passengerdeparture"
+
+    # First booking per passenger, sorted by id for the join
+    book_ids, first_book = np.unique(columns["passenger_id"][book], return_index=True)
+    book_times = columns["time"][book][first_book]
+
+    # First departure per passenger, back in departure order
+    depart_ids = columns["passenger_id"][depart]
+    depart_times = columns["time"][depart]
+    first_depart = np.sort(np.unique(depart_ids, return_index=True)[1])
+    depart_ids = depart_ids[first_depart]
+    depart_times = depart_times[first_depart]
+
+    position = np.searchsorted(book_ids, depart_ids)
+    position[position == len(book_ids)] = 0
+    booked = (book_ids[position] == depart_ids) if len(book_ids) else np.zeros(len(depart_ids), dtype=bool)
+    return depart_ids[booked], depart_times[booked] - book_times[position[booked]]
+
+
+def censored_latencies(columns):
+    """
+    Booking to departure wait of every booked passenger. Passengers that
+    never departed are censored at the end of the run: their wait is counted
+    up to the last simulation_end (or the last event), not dropped.
+    """
+    event_type = columns["event_type"]
+    depart_ids, latencies = passenger_latencies(columns)
+    book = event_type == "passengerbook"
+    book_ids, first_book = np.unique(columns["passenger_id"][book], return_index=True)
+    waiting = ~np.isin(book_ids, depart_ids)
+    end_times = columns["end_time"][event_type == "simulation_end"]
+    horizon = end_times.max() if len(end_times) else columns["time"].max()
+    waits = np.maximum(horizon - columns["time"][book][first_book][waiting], 0.0)
+    return np.concatenate([latencies, waits])
+
+
+def average_latency(columns, latencies=None):
+    """Total booking to departure wait over the number of bookings, as data_collector reports it. Returns (average, N)."""
+    if latencies is None:
+        latencies = passenger_latencies(columns)[1]
+    N = int(np.count_nonzero(columns["event_type"] == "passengerbook"))
+    # cumsum adds in departure order, so the total is bit-identical to a running sum
+    total_latency = float(np.cumsum(latencies)[-1]) if len(latencies) else 0.0
+    return total_latency / N if N > 0 else 0.0, N
+
+
+def latency_percentiles(latencies, percentiles=LATENCY_PERCENTILES):
+    if len(latencies) == 0:
+        return {p: float("nan") for p in percentiles}
+    return dict(zip(percentiles, np.percentile(latencies, percentiles).tolist()))
+
+
+def hourly_counts(columns, event_type):
+    """Number of events of one type in each hour of simulation time, indexed by hour."""
+    times = columns["time"][columns["event_type"] == event_type]
+    return np.bincount((times // 60).astype(np.int64))
+
+
+def average_per_hour(counts):
+    """Events over the last hour with any, matching data_collector's throughput and book rate."""
+    return int(counts.sum()) / (len(counts) - 1)
+
+
+def stranded_passengers(columns, filter=3):
+    """
+    Counts booked passengers that never arrived, and those still waiting at
+    any simulation_end that had booked more than `filter` hours before it
+    (each passenger once, as data_collector counts them).
+    """
+    event_type = columns["event_type"]
+    passenger_id = columns["passenger_id"]
+    book = event_type == "passengerbook"
+    arrival = event_type == "passengerarrival"
+
+    booked_ids = passenger_id[book]
+    stranded = ~np.isin(booked_ids, passenger_id[arrival])
+
+    # A passenger still waiting at several simulation_end rows counts once
+    long_waiting_rows = np.zeros(len(booked_ids), dtype=bool)
+    for end in np.flatnonzero(event_type == "simulation_end"):
+        before_end = np.arange(len(event_type)) < end
+        waiting = (~np.isin(booked_ids, passenger_id[arrival & before_end])) & before_end[book]
+        long_waiting_rows |= waiting & (columns["time"][book] < columns["end_time"][end] - 60*filter)
+    long_waiting = len(np.unique(booked_ids[long_waiting_rows]))
+
+    total_passengers = len(booked_ids)
+    n_stranded = int(np.count_nonzero(stranded))
+    return {
+        "total_passengers": total_passengers,
+        "stranded": n_stranded,
+        "stranded_percentage": n_stranded / total_passengers * 100 if n_stranded > 0 else 0,
+        "long_waiting": long_waiting,
+        "long_waiting_hours": filter,
+    }
+
+
+def fleet_utilization(columns):
+    """Share of aircraft time spent flying: enroute minutes over aircraft x simulated minutes."""
+    event_type = columns["event_type"]
+    n_aircraft = np.count_nonzero(event_type == "aircraftinit")
+    end_times = columns["end_time"][event_type == "simulation_end"]
+    horizon = end_times.max() if len(end_times) else columns["time"].max()
+    if n_aircraft == 0 or horizon <= 0:
+        return 0.0
+    flying = columns["enroute_time"][event_type == "aircraftdeparture"].sum()
+    return float(flying / (n_aircraft * horizon))
+
+
+def compute_kpis(columns):
+    """
+    Passenger KPIs from typed log columns (eventlog.load_event_columns, or
+    MemoryEventLog.columns() of a finished run), all with array operations.
+    """
+    latencies = passenger_latencies(columns)[1]
+    mean_latency, N = average_latency(columns, latencies)
+    throughput = hourly_counts(columns, "passengerarrival")
+    book_rate = hourly_counts(columns, "passengerbook")
+    kpis = {
+        "passengers": N,
+        "average_latency": mean_latency,
+        "latency_percentiles": latency_percentiles(latencies),
+        "throughput_per_hour": throughput,
+        "average_throughput": average_per_hour(throughput) if len(throughput) > 1 else float("nan"),
+        "book_rate_per_hour": book_rate,
+        "average_book_rate": average_per_hour(book_rate) if len(book_rate) > 1 else float("nan"),
+    }
+    kpis.update(stranded_passengers(columns))
+    return kpis
+
+
+def print_kpis(kpis):
+    print(f"Average Latency: {kpis['average_latency']}, Total Number of Passengers: {kpis['passengers']}")
+    print("Latency Percentiles: " + ", ".join(f"p{p}={value:.2f}" for p, value in kpis["latency_percentiles"].items()))
+    print(f"Average Throughput: {kpis['average_throughput']} passengers/hour")
+    print(f"Passenger Book Rate: {kpis['average_book_rate']} passengers/hour")
+    print(f"Number of Stranded Passengers: {kpis['stranded']}")
+    print(f"Percentage of Stranded Passengers: {kpis['stranded_percentage']}%")
+    print(f"Number of Standard Passengers (Waiting for longer than {kpis['long_waiting_hours']} hours): {kpis['long_waiting']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="Passenger KPIs",
+        description="Vectorized passenger KPIs from a logged events file."
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        required=True,
+        help="Event log to read (.csv, .npz or .parquet)."
+    )
+    args = parser.parse_args()
+
+    print_kpis(compute_kpis(load_event_columns(args.log_file)))
@@ -1,5 +1,27 @@
-from models import Vertiport, Aircraft, PassengerDemand, TransportTime, GroundTransport
-import csv, ast
+from models import Vertiport, Aircraft, PassengerDemand, TransportTime, TransportMatrix, GroundTransport
+import csv, ast, hashlib, os, pickle, tempfile
+
+# The files a scenario folder is loaded from
+SCENARIO_FILES = ["vertiport.txt", "starting_state.txt", "passenger_demand.csv", "transport_time.csv", "ground_transport.csv"]
+
+# A folder's parsed scenario is pickled next to its files. Bump the schema
+# version whenever the models or the compiled layout change.
+COMPILED_SCENARIO_FILE = ".compiled_scenario.pickle"
+SCENARIO_SCHEMA_VERSION = 1
+
+
+def scenario_digest(data_folder):
+    """SHA-256 over the names and contents of a scenario folder's files; missing files count as empty."""
+    digest = hashlib.sha256()
+    for name in SCENARIO_FILES:
+        path = os.path.join(data_folder, name)
+        data = b""
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+        digest.update(f"{name}:{len(data)}\n".encode())
+        digest.update(data)
+    return digest.hexdigest()
 
 
 def load_vertiports(filepath):
@@ -135,6 +157,25 @@ def load_transport_times(csv_filename):
     return transport_times
 
 
+def build_transport_matrix(transport_times, vertiports=None):
+    """
+    Builds a TransportMatrix from the list returned by load_transport_times.
+
+    If vertiports are given, the matrix rows/columns follow the vertiport order;
+    otherwise they follow the order in which names appear in the transport times.
+    """
+    names = None
+    if vertiports is not None:
+        names = [v.name for v in vertiports]
+        seen = set(names)
+        for t in transport_times:
+            for name in (t.src, t.dest):
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+    return TransportMatrix(transport_times, names)
+
+
 def load_ground_transport(file_path):
     """Load ground transport data from a CSV file and return a list of GroundTransport objects."""
     ground_transports = []
@@ -147,3 +188,98 @@ def load_ground_transport(file_path):
             times = row['dep_times'].split(',')
             ground_transports.append(GroundTransport(loc, times))
     return ground_transports
+
+
+def parse_scenario(data_folder, total_fly_time):
+    """Parses every file of a scenario folder, plus the transport matrix built from them."""
+    vertiports = load_vertiports(os.path.join(data_folder, 'vertiport.txt'))
+    transports = load_transport_times(os.path.join(data_folder, 'transport_time.csv'))
+    return {
+        "vertiports": vertiports,
+        "aircraft": load_starting_state(os.path.join(data_folder, 'starting_state.txt'), total_fly_time),
+        "demands": load_passenger_demand(os.path.join(data_folder, 'passenger_demand.csv')),
+        "transports": transports,
+        "ground_transports": load_ground_transport(os.path.join(data_folder, 'ground_transport.csv')),
+        "transport_matrix": build_transport_matrix(transports, vertiports),
+    }
+
+
+def file_stamps(data_folder):
+    """(mtime in ns, size) of each scenario file, None for missing ones."""
+    stamps = {}
+    for name in SCENARIO_FILES:
+        try:
+            st = os.stat(os.path.join(data_folder, name))
+            stamps[name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamps[name] = None
+    return stamps
+
+
+def read_compiled_scenario(data_folder):
+    """The folder's compiled scenario, or None if there is none or it has another schema version."""
+    try:
+        with open(os.path.join(data_folder, COMPILED_SCENARIO_FILE), "rb") as f:
+            compiled = pickle.loads(f.read())
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+    if not isinstance(compiled, dict) or compiled.get("schema") != SCENARIO_SCHEMA_VERSION:
+        return None
+    return compiled
+
+
+def write_compiled_scenario(data_folder, compiled):
+    """Writes the compiled scenario atomically; a folder we cannot write to just goes uncompiled."""
+    try:
+        fd, tmp = tempfile.mkstemp(dir=data_folder, prefix=COMPILED_SCENARIO_FILE + ".")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, os.path.join(data_folder, COMPILED_SCENARIO_FILE))
+    except OSError:
+        return False
+    return True
+
+
+def compile_scenario(data_folder):
+    """Parses a scenario folder and stores it as one binary artifact; returns the compiled scenario."""
+    stamps = file_stamps(data_folder)
+    compiled = {
+        "schema": SCENARIO_SCHEMA_VERSION,
+        "stamps": stamps,
+        "digest": scenario_digest(data_folder),
+        # The aircraft battery comes from the run's total_fly_time and is set on load
+        "scenario": parse_scenario(data_folder, 0),
+    }
+    write_compiled_scenario(data_folder, compiled)
+    return compiled
+
+
+def load_scenario(data_folder, total_fly_time, compiled=True):
+    """
+    Loads a scenario folder as a dict of its vertiports, aircraft, demands,
+    transports, ground_transports and transport_matrix, plus the digest of
+    its files (see scenario_digest).
+
+    With compiled=True the parsed scenario is read from the folder's compiled
+    artifact in a single read. The artifact is rebuilt when a file's mtime or
+    size changed and its contents did too; files that were only touched just
+    get their stamps refreshed.
+    """
+    if not compiled:
+        return {**parse_scenario(data_folder, total_fly_time), "digest": scenario_digest(data_folder)}
+
+    compiled = read_compiled_scenario(data_folder)
+    stamps = file_stamps(data_folder)
+    if compiled is None:
+        compiled = compile_scenario(data_folder)
+    elif compiled["stamps"] != stamps:
+        if compiled["digest"] == scenario_digest(data_folder):
+            compiled["stamps"] = stamps
+            write_compiled_scenario(data_folder, compiled)
+        else:
+            compiled = compile_scenario(data_folder)
+
+    scenario = compiled["scenario"]
+    for aircraft in scenario["aircraft"]:
+        aircraft.bat_per = total_fly_time
+    return {**scenario, "digest": compiled["digest"]}
@@ -3,12 +3,16 @@ import argparse
 import os
 import sys
 
-from load_data import load_vertiports, load_ground_transport, load_transport_times, load_passenger_demand, load_starting_state 
+from load_data import load_scenario
 from simulation import Simulation
 from event import Event, AircraftFlight, PassengerEvent
 from scheduler import NaiveScheduler, RewardScheduler
+from eventqueue import EVENT_QUEUES
+from tracing import TRACE_LEVELS, Tracer
+from eventprocessor import get_log_file_path
+from eventlog import EVENT_LOG_SINKS, open_event_log, MultiEventLog
 
-def main(data_folder, total_fly_time):
+def main(data_folder, total_fly_time, event_queue="heap", trace="debug", log_thread=False, columnar_log=None, event_log="csv", seed=None, compiled_scenario=True):
     # Check if the specified folder exists
     if not os.path.isdir(data_folder):
         print(f"Error: The specified folder '{data_folder}' does not exist.")
@@ -18,13 +22,21 @@ def main(data_folder, total_fly_time):
     print(f"Total Flight Time: {total_fly_time}")
     print(f"Data folder location: {data_folder}")
 
-    vertiport_list = load_vertiports(data_folder + 'vertiport.txt')
-    all_aircraft = load_starting_state(data_folder + 'starting_state.txt', total_fly_time)
-    demands = load_passenger_demand(data_folder + 'passenger_demand.csv')
-    transports = load_transport_times(data_folder + 'transport_time.csv')
-    ground_transports = load_ground_transport(data_folder + 'ground_transport.csv')
+    scenario = load_scenario(data_folder, total_fly_time, compiled=compiled_scenario)
+    vertiport_list = scenario["vertiports"]
+    all_aircraft = scenario["aircraft"]
+    demands = scenario["demands"]
+    transports = scenario["transports"]
+    ground_transports = scenario["ground_transports"]
+    transport_matrix = scenario["transport_matrix"]
 
-    simulation = Simulation(vertiport_list, all_aircraft, demands, transports, ground_transports)
+    log_file_path = get_log_file_path(event_log if event_log in ("npz", "parquet") else "csv")
+    event_log = open_event_log(event_log, log_file_path, background=log_thread)
+    if columnar_log and columnar_log != event_log:
+        # Write a typed columnar copy next to the main log, e.g. logged_events_0.npz
+        event_log = MultiEventLog([event_log, open_event_log(columnar_log, log_file_path)])
+
+    simulation = Simulation(vertiport_list, all_aircraft, demands, transports, ground_transports, transport_matrix=transport_matrix, event_queue=EVENT_QUEUES[event_queue](), tracer=Tracer(trace), event_log=event_log, seed=seed)
     simulation.add_scheduler(RewardScheduler(simulation))
 
     # simulation.print_simulation_initialization()
@@ -34,6 +46,8 @@ def main(data_folder, total_fly_time):
     # simulation.print_vertiport_aircraft()
 
     simulation.event_processor.run()
+    simulation.event_processor.close()
+    # simulation.event_processor.print_dispatch_stats()
     # simulation.print_vertiport_aircraft()
     # simulation.print_vertiport_states()
 
@@ -57,11 +71,53 @@ if __name__ == "__main__":
         default="../data/example_1/",
         help="Path to the folder that contains your data."
     )
+    parser.add_argument(
+        "--event-queue",
+        choices=sorted(EVENT_QUEUES),
+        default="heap",
+        help="Event queue backend. 'calendar' is experimental: in CPython it runs about 30-40%% slower than the default heap."
+    )
+    parser.add_argument(
+        "--trace",
+        choices=list(TRACE_LEVELS),
+        default="debug",
+        help="Simulation trace level; 'off' skips all per-event output."
+    )
+    parser.add_argument(
+        "--log-thread",
+        action="store_true",
+        help="Write the event log from a background thread."
+    )
+    parser.add_argument(
+        "--event-log",
+        choices=EVENT_LOG_SINKS,
+        default="csv",
+        help="Where the event log goes; 'memory' and 'null' write no file."
+    )
+    parser.add_argument(
+        "--columnar-log",
+        choices=["npz", "parquet"],
+        default=None,
+        help="Also write a typed columnar copy of the event log (parquet needs pyarrow)."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the simulation's random generator, for a reproducible run."
+    )
+    parser.add_argument(
+        "--parse-scenario",
+        action="store_true",
+        help="Parse the scenario files instead of reading the folder's compiled scenario."
+    )
 
     # Parse the arguments from the command line
     args = parser.parse_args()
+    if args.columnar_log is not None and args.columnar_log == args.event_log:
+        parser.error(f"--columnar-log {args.columnar_log} would write the same file as --event-log {args.event_log}")
 
     total_fly_time = args.total_fly_time
     data_folder = args.data_folder
 
-    main(data_folder, total_fly_time)
+    main(data_folder, total_fly_time, args.event_queue, args.trace, args.log_thread, args.columnar_log, args.event_log, args.seed, not args.parse_scenario)
@@ -1,16 +1,16 @@
 import matplotlib.pyplot as plt
+import numpy as np
+from collections import deque
 
 class Vertiport:
     def __init__(self, id=0, name="", capacity=0, current_aircraft=None, current_passengers=None):
         if current_aircraft is None:
             current_aircraft = []
-        if current_passengers is None:
-            current_passengers = []
         self.id = id
         self.name = name
         self.capacity = capacity
         self.current_aircraft = current_aircraft
-        self.current_passengers = current_passengers
+        self.current_passengers = PassengerQueue(current_passengers)
     
     def __str__(self):
         passengers_str = ', '.join(str(p) for p in self.current_passengers)
@@ -31,7 +31,99 @@ class Vertiport:
             f"Aircraft: [{aircraft_str}]\n"
         )
     
+class PassengerQueue:
+    """
+    Waiting passengers at a vertiport, bucketed by destination. Each bucket is a
+    deque ordered by book_time (oldest on the left). Buckets are removed when
+    they empty, so `by_destination` keeps destinations in the order their oldest
+    waiting passenger arrived.
+
+    Alongside each bucket we keep the running sum of book_time up to every
+    passenger. Boarding only takes passengers off the newest end, so the sum for
+    a bucket is always the last running sum and never drifts.
+    """
+    def __init__(self, passengers=None):
+        self.by_destination = {}
+        self.book_time_sums = {}
+        self.count = 0
+        if passengers is not None:
+            for p in passengers:
+                self.add(p)
+
+    def add(self, passenger):
+        bucket = self.by_destination.get(passenger.dest)
+        if bucket is None:
+            bucket = self.by_destination[passenger.dest] = deque()
+            self.book_time_sums[passenger.dest] = deque()
+        sums = self.book_time_sums[passenger.dest]
+        if bucket and bucket[-1].book_time > passenger.book_time:
+            # Out of order booking, walk back to keep the bucket sorted
+            i = len(bucket)
+            while i > 0 and bucket[i - 1].book_time > passenger.book_time:
+                i -= 1
+            bucket.insert(i, passenger)
+            total = sums[i - 1] if i > 0 else 0
+            for j in range(i, len(bucket)):
+                total += bucket[j].book_time
+                if j < len(sums):
+                    sums[j] = total
+                else:
+                    sums.append(total)
+        else:
+            bucket.append(passenger)
+            sums.append((sums[-1] if sums else 0) + passenger.book_time)
+        self.count += 1
+
+    def destinations(self):
+        """Returns a {dest: deque} copy that callers may prune without touching the queue."""
+        return dict(self.by_destination)
+
+    def waiting_for(self, dest):
+        return len(self.by_destination.get(dest, ()))
+
+    def oldest(self, dest):
+        bucket = self.by_destination.get(dest)
+        return bucket[0] if bucket else None
+
+    def newest(self, dest):
+        bucket = self.by_destination.get(dest)
+        return bucket[-1] if bucket else None
+
+    def stats(self, dest):
+        """Returns (count, sum of book_time, oldest book_time) for dest in O(1)."""
+        bucket = self.by_destination.get(dest)
+        if not bucket:
+            return 0, 0, None
+        return len(bucket), self.book_time_sums[dest][-1], bucket[0].book_time
+
+    def board(self, dest, k):
+        """Removes and returns up to k of the newest passengers for dest, newest first."""
+        bucket = self.by_destination.get(dest)
+        if not bucket:
+            return []
+        k = max(0, min(k, len(bucket)))
+        sums = self.book_time_sums[dest]
+        boarded = []
+        for _ in range(k):
+            boarded.append(bucket.pop())
+            sums.pop()
+        if not bucket:
+            del self.by_destination[dest]
+            del self.book_time_sums[dest]
+        self.count -= k
+        return boarded
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for bucket in self.by_destination.values():
+            yield from bucket
+
+
 class Passenger:
+    __slots__ = ("src", "dest", "id", "book_time")
+
     def __init__(self, src, dest, id, book_time=0):
         self.src = src 
         self.dest = dest
@@ -143,6 +235,58 @@ class TransportTime:
     def display_info(self):
         print(self)
 
+class TransportMatrix:
+    """
+    Dense origin-destination view of the transport times. Vertiport names are
+    mapped to row/column indices and missing routes are stored as NaN.
+    """
+    def __init__(self, transport_times=None, names=None):
+        if transport_times is None:
+            transport_times = []
+        if names is None:
+            names = []
+            seen = set()
+            for t in transport_times:
+                for name in (t.src, t.dest):
+                    if name not in seen:
+                        seen.add(name)
+                        names.append(name)
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.times = np.full((len(self.names), len(self.names)), np.nan)
+        for t in transport_times:
+            i = self.index.get(t.src)
+            j = self.index.get(t.dest)
+            # Keep the first entry for a route, like the old linear scan did
+            if i is not None and j is not None and np.isnan(self.times[i, j]):
+                self.times[i, j] = t.time
+
+    def get(self, src, dest):
+        i = self.index.get(src)
+        j = self.index.get(dest)
+        if i is None or j is None:
+            return None
+        time = self.times.item(i, j)
+        if time != time:
+            return None
+        return time
+
+    def row(self, src, dests=None):
+        """
+        Transport times from src to every vertiport, or to the given
+        destinations in order (NaN where there is no route).
+        """
+        times = self.times[self.index[src]]
+        if dests is None:
+            return times
+        return times[[self.index[dest] for dest in dests]]
+
+    def __str__(self):
+        return f"TransportMatrix({len(self.names)} vertiports)"
+
+    def display_info(self):
+        print(self)
+
 class GroundTransport:
     def __init__(self, loc=0, times=None):
         if times is None:
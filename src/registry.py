@@ -0,0 +1,50 @@
+from models import Vertiport, Aircraft
+
+
+class EntityRegistry:
+    """
+    Shared lookup tables for the simulation. Maps vertiport names to Vertiport
+    objects and aircraft ids to the vertiport they are currently parked at
+    (None while in flight or before they are placed).
+    """
+    def __init__(self, vertiports=None):
+        if vertiports is None:
+            vertiports = []
+        self.vertiports = {}
+        self.positions = {}
+        self.aircraft_locations = {}
+        for v in vertiports:
+            self.add_vertiport(v)
+
+    def add_vertiport(self, vertiport: Vertiport):
+        # Keep the first vertiport registered under a name, like the old scans did
+        if vertiport.name not in self.vertiports:
+            self.vertiports[vertiport.name] = vertiport
+            self.positions[vertiport] = len(self.positions)
+
+    def get_vertiport(self, name):
+        return self.vertiports.get(name)
+
+    def position(self, vertiport: Vertiport):
+        """Index of the vertiport in the simulation's vertiport list, used to keep scan order."""
+        return self.positions[vertiport]
+
+    def get_aircraft_vertiport(self, aircraft: Aircraft):
+        return self.aircraft_locations.get(aircraft.id)
+
+    def place_aircraft(self, aircraft: Aircraft, name):
+        """Parks the aircraft at the named vertiport. Returns the vertiport, or None if unknown."""
+        vertiport = self.vertiports.get(name)
+        if vertiport is None:
+            return None
+        vertiport.current_aircraft.append(aircraft)
+        self.aircraft_locations[aircraft.id] = vertiport
+        return vertiport
+
+    def remove_aircraft(self, aircraft: Aircraft):
+        """Removes the aircraft from its vertiport. Returns the vertiport, or None if it was not parked."""
+        vertiport = self.aircraft_locations.pop(aircraft.id, None)
+        if vertiport is None:
+            return None
+        vertiport.current_aircraft.remove(aircraft)
+        return vertiport
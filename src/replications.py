@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+import argparse
+import copy
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from load_data import load_scenario
+from simulation import Simulation
+from scheduler import RewardScheduler
+from tracing import Tracer
+from kpi import censored_latencies, hourly_counts, average_per_hour, stranded_passengers, fleet_utilization
+from resultcache import DEFAULT_MAX_BYTES, ResultCache, cache_key
+
+REPLICATION_KPIS = ["mean_latency", "p95_latency", "throughput", "stranded", "fleet_utilization"]
+
+# Coverage of the confidence interval of each KPI's mean
+CONFIDENCE = 0.95
+
+# The scenario each worker process loads once, copied for every replication,
+# and the worker's result cache (None when caching is off)
+scenario = None
+cache = None
+
+
+def init_worker(data_folder, total_fly_time, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES):
+    global scenario, cache
+    scenario = load_scenario(data_folder, total_fly_time)
+    scenario["data_folder"] = os.path.abspath(data_folder)
+    scenario["total_fly_time"] = total_fly_time
+    cache = ResultCache(cache_dir, cache_bytes) if cache_dir else None
+
+
+def replication_kpis(columns):
+    """
+    One replication's KPIs. Passengers still waiting at the end of the run
+    count in the latency KPIs with their wait up to the end (see
+    kpi.censored_latencies), so a scheduler is not rewarded for stranding them.
+    """
+    latencies = censored_latencies(columns)
+    throughput = hourly_counts(columns, "passengerarrival")
+    return {
+        "mean_latency": float(latencies.mean()) if len(latencies) else float("nan"),
+        "p95_latency": float(np.percentile(latencies, 95)) if len(latencies) else float("nan"),
+        "throughput": average_per_hour(throughput) if len(throughput) > 1 else float("nan"),
+        "stranded": stranded_passengers(columns)["stranded"],
+        "fleet_utilization": fleet_utilization(columns),
+    }
+
+
+def run_replication(seed, max_event_time=20, scheduler_kwargs=None):
+    """
+    One seeded run of the worker's scenario, logged in memory; returns its
+    KPIs. scheduler_kwargs are passed on to RewardScheduler. With a result
+    cache, a replication already run is read back instead of simulated.
+    """
+    if cache is not None:
+        run_params = {"total_fly_time": scenario["total_fly_time"], "max_event_time": max_event_time}
+        key = cache_key(scenario["digest"], RewardScheduler, scheduler_kwargs, seed, run_params)
+        hit = cache.get(key, columns=False)
+        if hit is not None:
+            kpis = hit[0]
+            kpis["seed"] = seed
+            return kpis
+
+    # Fresh copies of the mutable model objects; the transport matrix is read-only and shared
+    vertiports, aircraft, demands, transports, ground_transports = copy.deepcopy((
+        scenario["vertiports"], scenario["aircraft"], scenario["demands"],
+        scenario["transports"], scenario["ground_transports"],
+    ))
+    simulation = Simulation(vertiports, aircraft, demands, transports, ground_transports,
+                            transport_matrix=scenario["transport_matrix"], tracer=Tracer("off"), event_log="memory", seed=seed)
+    simulation.add_scheduler(RewardScheduler(simulation, **(scheduler_kwargs or {})))
+    simulation.add_init_aircraft_state()
+    simulation.add_all_passenger_events()
+    simulation.event_processor.run(max_event_time=max_event_time)
+
+    columns = simulation.event_log.columns()
+    kpis = replication_kpis(columns)
+    if cache is not None:
+        description = {"data_folder": scenario["data_folder"], "scheduler": RewardScheduler.__name__,
+                       "scheduler_params": scheduler_kwargs, "seed": seed, "run": run_params}
+        cache.put(key, kpis, columns, description)
+    kpis["seed"] = seed
+    return kpis
+
+
+def run_replications(data_folder, n_replications, workers=None, base_seed=0, total_fly_time=90.0, max_event_time=20,
+                     cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES):
+    """
+    Runs seeds base_seed .. base_seed + n_replications - 1 across a process
+    pool; one row of KPIs per replication. cache_dir turns on the result cache.
+    """
+    workers = workers or os.cpu_count()
+    seeds = range(base_seed, base_seed + n_replications)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(data_folder, total_fly_time, cache_dir, cache_bytes)) as pool:
+        rows = list(pool.map(partial(run_replication, max_event_time=max_event_time), seeds,
+                             chunksize=max(1, n_replications // (4 * workers))))
+    return pd.DataFrame(rows).set_index("seed")
+
+
+def t_central_probability(t, df):
+    """P(|T| < t) for Student's t with integer df degrees of freedom (Abramowitz and Stegun 26.7.3-4)."""
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    if df % 2:
+        term, total = 1.0, 1.0 if df > 1 else 0.0
+        for k in range(3, df, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    term, total = 1.0, 1.0
+    for k in range(2, df, 2):
+        term *= cos2 * (k - 1) / k
+        total += term
+    return math.sin(theta) * total
+
+
+def t_quantile(df, confidence=CONFIDENCE):
+    """Half-width multiplier of a two-sided interval: t with P(|T| < t) = confidence, found by bisection."""
+    if df < 1:
+        return float("nan")
+    low, high = 0.0, 1.0
+    while t_central_probability(high, df) < confidence:
+        low, high = high, 2 * high
+    for _ in range(100):
+        mid = (low + high) / 2
+        if t_central_probability(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def summarize_replications(results, kpis=REPLICATION_KPIS):
+    """
+    Mean, spread, 95% confidence interval of the mean (Student's t with
+    replications - 1 degrees of freedom) and percentiles of each KPI.
+    """
+    values = results[kpis].astype(float)
+    mean, std, count = values.mean(), values.std(), values.count()
+    half_width = count.map(lambda n: t_quantile(int(n) - 1)) * std / np.sqrt(count)
+    summary = pd.DataFrame({
+        "mean": mean,
+        "std": std,
+        "ci95_low": mean - half_width,
+        "ci95_high": mean + half_width,
+        "p5": values.quantile(0.05),
+        "p50": values.quantile(0.5),
+        "p95": values.quantile(0.95),
+    })
+    summary.index.name = "kpi"
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="Replication Runner",
+        description="Runs seeded replications of a scenario in parallel and reports KPIs with confidence intervals."
+    )
+    parser.add_argument(
+        "--data-folder",
+        type=str,
+        default="../data/example_1/",
+        help="Path to the folder that contains your data."
+    )
+    parser.add_argument(
+        "--total-fly-time",
+        type=float,
+        default=90.0,
+        help="Total flight time (e.g., in minutes)."
+    )
+    parser.add_argument(
+        "-n", "--replications",
+        type=int,
+        default=100,
+        help="Number of replications."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the first replication; replication i uses seed + i."
+    )
+    parser.add_argument(
+        "--max-event-time",
+        type=float,
+        default=20,
+        help="Simulated hours per replication."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (defaults to the number of CPUs)."
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Optional CSV file for the per-replication KPIs."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Result cache directory; replications already in it are not re-run."
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 2**20,
+        help="Result cache size limit in MB; least recently used results are evicted beyond it."
+    )
+    args = parser.parse_args()
+
+    print(f"Data folder location: {args.data_folder}")
+    start = time.perf_counter()
+    results = run_replications(args.data_folder, args.replications, args.workers, args.seed,
+                               args.total_fly_time, args.max_event_time, args.cache_dir, args.cache_size * 2**20)
+    elapsed = time.perf_counter() - start
+    if args.out:
+        results.to_csv(args.out)
+
+    print(f"=== {args.replications} REPLICATIONS in {elapsed:.1f} s ===")
+    print(summarize_replications(results).to_string(float_format=lambda x: f"{x:,.3f}"))
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from eventlog import LOG_COLUMNS, load_event_columns
+
+# Bumped whenever the layout of an entry changes
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 2 * 2**30
+
+ENTRY_FILE = "entry.json"
+LOG_FILE = "log.npz"
+
+# Past this share of max_bytes, put() measures the cache's real size;
+# once it is over max_bytes, entries are evicted down to PRUNE_FRACTION of it
+RESCAN_FRACTION = 0.9
+PRUNE_FRACTION = 0.8
+
+# prune() removes temporary entry directories older than this many seconds,
+# left behind by writers that died before renaming them into place
+STALE_TMP_AGE = 3600
+
+code_digest = None
+
+
+def code_version():
+    """SHA-256 of this directory's Python sources, so a code change invalidates every cached result."""
+    global code_digest
+    if code_digest is None:
+        digest = hashlib.sha256(f"format {CACHE_FORMAT}\n".encode())
+        src = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(src)):
+            if name.endswith(".py"):
+                with open(os.path.join(src, name), "rb") as f:
+                    data = f.read()
+                digest.update(f"{name}:{len(data)}\n".encode())
+                digest.update(data)
+        code_digest = digest.hexdigest()
+    return code_digest
+
+
+def canonical(value):
+    """Reduces scheduler parameters (numbers, arrays, RewardCoefficients, ...) to plain JSON values."""
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return canonical(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return repr(value)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return {type(value).__name__: canonical(vars(value))}
+
+
+def cache_key(scenario_digest, scheduler, scheduler_params, seed, run_params=None):
+    """
+    Content address of one simulation result: the scenario files' digest
+    (load_data.scenario_digest), the scheduler class name and parameters, the
+    seed, any other run settings and the code version.
+    """
+    description = {
+        "scenario": scenario_digest,
+        "scheduler": scheduler if isinstance(scheduler, str) else scheduler.__name__,
+        "scheduler_params": canonical(scheduler_params or {}),
+        "seed": seed,
+        "run": canonical(run_params or {}),
+        "code": code_version(),
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of simulation results, one directory per cache key holding
+    the run's KPIs (and a description of the run) as JSON and its event log
+    as a columnar .npz. Entries are written to a temporary directory and
+    renamed into place, so several worker processes can share a cache.
+
+    Reading an entry marks it as used; once the cache grows past max_bytes
+    the least recently used entries are evicted. Every put() counts the
+    entries on disk, so entries written by other processes count towards
+    the limit too.
+    """
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.entry_bytes = None  # Mean entry size at the last measurement
+        os.makedirs(root, exist_ok=True)
+
+    def entry_path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key, columns=True):
+        """Returns (kpis, log columns) for the key, or None on a miss; columns=False skips reading the log."""
+        path = self.entry_path(key)
+        try:
+            with open(os.path.join(path, ENTRY_FILE)) as f:
+                entry = json.load(f)
+            log = load_event_columns(os.path.join(path, LOG_FILE)) if columns else None
+            os.utime(os.path.join(path, ENTRY_FILE))
+        except (OSError, ValueError):
+            # Missing, or evicted by another process while we read it
+            return None
+        return entry["kpis"], log
+
+    def put(self, key, kpis, columns, description=None):
+        """Stores a result; a key that is already cached is left as it is."""
+        path = self.entry_path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with open(os.path.join(tmp, LOG_FILE), "wb") as f:
+                np.savez(f, **{name: columns[name] for name in LOG_COLUMNS})
+            with open(os.path.join(tmp, ENTRY_FILE), "w") as f:
+                json.dump({"key": key, "created": time.time(), "kpis": kpis,
+                           "description": canonical(description or {})}, f)
+            os.rename(tmp, path)
+        except OSError:
+            # Another process stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(path):
+                raise
+            return
+
+        # Counting the entries is cheap; their real size is only measured near the limit
+        if self.entry_bytes is None or self.entry_count() * self.entry_bytes > RESCAN_FRACTION * self.max_bytes:
+            self.remove_stale_tmp(time.time())
+            size, count = self.disk_usage()
+            self.entry_bytes = size / max(count, 1)
+            if size > self.max_bytes:
+                self.prune(PRUNE_FRACTION * self.max_bytes)
+
+    def shards(self):
+        for shard in sorted(os.listdir(self.root)):
+            shard_path = os.path.join(self.root, shard)
+            if os.path.isdir(shard_path):
+                yield shard_path
+
+    def entry_count(self):
+        """Number of entries, without reading them."""
+        return sum(1 for shard_path in self.shards() for key in os.listdir(shard_path) if not key.startswith("."))
+
+    def disk_usage(self):
+        """(bytes, entries) of every entry, from file sizes only."""
+        size, count = 0, 0
+        for shard_path in self.shards():
+            for key in os.listdir(shard_path):
+                if key.startswith("."):
+                    continue
+                try:
+                    size += entry_size(os.path.join(shard_path, key))
+                except OSError:
+                    # Evicted by another process
+                    continue
+                count += 1
+        return size, count
+
+    def scan(self):
+        """Yields every entry's key, size, creation and last use time and run description."""
+        for shard_path in self.shards():
+            for key in os.listdir(shard_path):
+                if key.startswith("."):
+                    # An entry still being written
+                    continue
+                path = os.path.join(shard_path, key)
+                try:
+                    with open(os.path.join(path, ENTRY_FILE)) as f:
+                        entry = json.load(f)
+                    last_used = os.path.getmtime(os.path.join(path, ENTRY_FILE))
+                    size = entry_size(path)
+                except (OSError, ValueError):
+                    continue
+                yield {"key": key, "bytes": size, "created": entry["created"], "last_used": last_used,
+                       "description": entry["description"]}
+
+    def entries(self):
+        """The cache contents as a table, most recently used first."""
+        rows = []
+        for entry in self.scan():
+            description = entry.pop("description")
+            rows.append({**entry, "data_folder": description.get("data_folder"), "scheduler": description.get("scheduler"),
+                         "seed": description.get("seed")})
+        table = pd.DataFrame(rows, columns=["key", "bytes", "created", "last_used", "data_folder", "scheduler", "seed"])
+        for column in ("created", "last_used"):
+            table[column] = pd.to_datetime(table[column], unit="s")
+        return table.sort_values("last_used", ascending=False, kind="stable").reset_index(drop=True)
+
+    def prune(self, max_bytes=None, older_than=None):
+        """
+        Evicts least recently used entries until the cache holds at most
+        max_bytes, and any entry unused for older_than seconds. Temporary
+        directories older than STALE_TMP_AGE are removed too. Returns the
+        number of entries and bytes removed.
+        """
+        now = time.time()
+        tmp_freed = self.remove_stale_tmp(now)
+        entries = sorted(self.scan(), key=lambda entry: entry["last_used"])
+        total = sum(entry["bytes"] for entry in entries)
+        removed, freed = 0, 0
+        for entry in entries:
+            too_big = max_bytes is not None and total - freed > max_bytes
+            too_old = older_than is not None and now - entry["last_used"] > older_than
+            if not (too_big or too_old):
+                continue
+            shutil.rmtree(self.entry_path(entry["key"]), ignore_errors=True)
+            removed += 1
+            freed += entry["bytes"]
+        return removed, freed + tmp_freed
+
+    def remove_stale_tmp(self, now):
+        """Removes the temporary directories of writers that died mid-put; returns the bytes freed."""
+        freed = 0
+        for shard_path in self.shards():
+            for name in os.listdir(shard_path):
+                if not name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(shard_path, name)
+                try:
+                    if now - os.path.getmtime(path) <= STALE_TMP_AGE:
+                        continue
+                    size = entry_size(path)
+                except OSError:
+                    # Renamed into place or removed meanwhile
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                freed += size
+        return freed
+
+    def clear(self):
+        return self.prune(max_bytes=0)
+
+
+def entry_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="Result Cache",
+        description="Inspects or prunes the on-disk cache of simulation results."
+    )
+    parser.add_argument(
+        "command",
+        choices=["list", "stats", "prune", "clear"],
+        help="What to do with the cache."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        required=True,
+        help="Cache directory."
+    )
+    parser.add_argument(
+        "--max-size",
+        type=float,
+        default=None,
+        help="prune: evict least recently used entries down to this many MB."
+    )
+    parser.add_argument(
+        "--older-than",
+        type=float,
+        default=None,
+        help="prune: evict entries not used for this many days."
+    )
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir)
+    if args.command == "list":
+        print(cache.entries().to_string(index=False))
+    elif args.command == "stats":
+        entries = cache.entries()
+        print(f"{len(entries)} entries, {entries['bytes'].sum() / 2**20:,.1f} MB in {args.cache_dir}")
+        if len(entries):
+            print(f"Last used between {entries['last_used'].min()} and {entries['last_used'].max()}")
+            print(entries.groupby(["data_folder", "scheduler"]).size().rename("entries").to_string())
+    elif args.command == "prune":
+        if args.max_size is None and args.older_than is None:
+            parser.error("prune needs --max-size and/or --older-than")
+        max_bytes = args.max_size * 2**20 if args.max_size is not None else None
+        older_than = args.older_than * 24 * 3600 if args.older_than is not None else None
+        removed, freed = cache.prune(max_bytes, older_than)
+        print(f"Removed {removed} entries ({freed / 2**20:,.1f} MB)")
+    elif args.command == "clear":
+        removed, freed = cache.clear()
+        print(f"Removed {removed} entries ({freed / 2**20:,.1f} MB)")
@@ -0,0 +1,30 @@
+import numpy as np
+
+# Order of the reward terms along the feature and coefficient axes
+REWARD_TERMS = (
+    "total_passengers",
+    "highest_latency",
+    "average_latency",
+    "total_passengers_at_vertiport",
+    "next_ground_time",
+)
+
+# Each term is max(slope * x + intercept, floor); RewardScheduler's reward when no coefficients are given
+DEFAULT_SLOPES = [5, 3/4, 2, 1/2, -1/5]
+DEFAULT_INTERCEPTS = [0, -20, -2.5, 0, 20]
+DEFAULT_FLOORS = [-np.inf, -np.inf, -np.inf, -np.inf, 0]
+
+
+class RewardCoefficients:
+    """
+    Coefficients of the piecewise-linear reward terms, one entry per term of
+    REWARD_TERMS. RewardScheduler takes them so sweeps can vary them.
+    """
+    def __init__(self, slopes=None, intercepts=None, floors=None):
+        self.slopes = np.asarray(DEFAULT_SLOPES if slopes is None else slopes, dtype=float)
+        self.intercepts = np.asarray(DEFAULT_INTERCEPTS if intercepts is None else intercepts, dtype=float)
+        self.floors = np.asarray(DEFAULT_FLOORS if floors is None else floors, dtype=float)
+
+    def __str__(self):
+        return (f"RewardCoefficients(slopes={self.slopes.tolist()}, "
+                f"intercepts={self.intercepts.tolist()}, floors={self.floors.tolist()})")
@@ -1,5 +1,7 @@
-from vars_types import get_load_time, generate_flight_id, get_transport_time
+from vars_types import get_load_time, get_transport_time
 from event import AircraftFlight, Charge
+from reward import REWARD_TERMS, RewardCoefficients
+import numpy as np
 import math
 
 
@@ -42,7 +44,7 @@ class NaiveScheduler(Scheduler):
                 if aircraft.set_to_depart() or aircraft.is_charging():
                     continue
 
-                destination_map = self._group_passengers_by_destination(vertiport.current_passengers)
+                destination_map = vertiport.current_passengers.destinations()
 
                 chosen_destination, passengers_for_dest, transport_time = self.select_trip_for_aircraft(aircraft, vertiport, destination_map)
 
@@ -50,24 +52,18 @@ class NaiveScheduler(Scheduler):
                     continue
 
                 # Load as many passengers as we can onto the aircraft
-                loaded_passengers = []
-                while len(passengers_for_dest) > 0 and len(aircraft.load) < aircraft.capacity:
-                    p = passengers_for_dest.pop()
-                    success = aircraft.add_passenger(p)
-                    if success:
-                        loaded_passengers.append(p)
-                        vertiport.current_passengers.remove(p)
-                    else:
-                        # Aircraft is full or something else
-                        break
+                loaded_passengers = vertiport.current_passengers.board(chosen_destination, aircraft.capacity - len(aircraft.load))
+                for p in loaded_passengers:
+                    aircraft.add_passenger(p)
 
                 if not loaded_passengers:
-                    print("Loaded passengers fail?")
+                    if self.simulation.trace.warn:
+                        self.simulation.trace("Loaded passengers fail?")
                     continue
 
 
                 # Create a new flight event. We assume you have a class like AircraftFlight:
-                new_flight_id = generate_flight_id()
+                new_flight_id = self.simulation.context.next_flight_id()
                 departure_time = current_time + get_load_time(randomize=False)
 
                 new_flight = AircraftFlight(
@@ -139,58 +135,62 @@ class NaiveScheduler(Scheduler):
             return chosen_destination, passengers_for_dest, transport_time
 
         # print(f"Charging Aircraft {aircraft.id} with {aircraft.bat_per} to charge for 30 minutes.")
-        self.simulation.event_processor.add_charge(Charge(aircraft, 30))
+        self.simulation.event_processor.add_charge(Charge(aircraft, 30, self.simulation.context.next_charge_id()))
         return None, [], None
 
 
-    def _group_passengers_by_destination(self, passengers):
-        """
-        Returns a dict: {destination_name: [list_of_passengers]}
-        """
-        destination_map = {}
-        for p in passengers:
-            if p.dest not in destination_map:
-                destination_map[p.dest] = []
-            destination_map[p.dest].append(p)
-        return destination_map
-
 
 
 class RewardScheduler(Scheduler):
-    def __init__(self, simulation):
+    """
+    Ranks each vertiport's destinations with a reward function and flies the
+    best route an aircraft can make. With incremental=True only the vertiports
+    and aircraft touched since the last call are re-planned; this gives the
+    same result as rescanning everything, because an aircraft that was left
+    idle stays idle until its vertiport's queue or its own state changes. The
+    exception is a route skipped for a non-positive reward, which can change
+    with time, so those aircraft are re-checked on the next call.
+
+    The reward terms come from RewardCoefficients (reward.py; the defaults
+    when none are given). min_group_size is the fewest waiting passengers
+    worth a flight, and charge times are clamped to [min_charge_time,
+    max_charge_time] minutes.
+    """
+    def __init__(self, simulation, incremental=True, coefficients=None, min_group_size=2, min_charge_time=15, max_charge_time=90):
         self.simulation = simulation
-
-    def total_passenger_f(self, x):
-        return 5*x
-    
-    def highest_latency_f(self, x):
-        # return math.exp(x/10) + 2.5
-        return (3/4)*x - 20
-    
-    def average_latency_f(self, x):
-        # return math.exp(x/5) - 2.5
-        return 2*x - 2.5
-
-    def total_passengers_at_vertiport_f(self, x):
-        return (1/2)*x
-    
-    def next_ground_time_f(self, x):
-        return max((-x + 100)/5, 0)
+        self.incremental = incremental
+        if coefficients is None:
+            coefficients = RewardCoefficients()
+        if coefficients.slopes.shape != (len(REWARD_TERMS),):
+            raise ValueError(f"RewardScheduler takes a single coefficient set of {len(REWARD_TERMS)} terms, "
+                             f"got slopes of shape {coefficients.slopes.shape}")
+        self.coefficients = coefficients
+        # (slope, intercept, floor) of each term as Python floats
+        self.terms = list(zip(coefficients.slopes.tolist(), coefficients.intercepts.tolist(), coefficients.floors.tolist()))
+        self.min_group_size = min_group_size
+        self.min_charge_time = min_charge_time
+        self.max_charge_time = max_charge_time
+        self.recheck_aircraft = set()
 
     def reward_value(self, total_passengers, highest_latency, average_latency, total_passengers_at_vertiport, next_ground_time):
-        return (self.total_passenger_f(total_passengers) + self.highest_latency_f(highest_latency) + self.average_latency_f(average_latency) + self.total_passengers_at_vertiport_f(total_passengers_at_vertiport)) + self.next_ground_time_f(next_ground_time)
-
-    def reward_ranking(self, current_time, destination_map):
+        """Sum of the max(slope * x + intercept, floor) terms, added left to right."""
+        value = None
+        for (slope, intercept, floor), x in zip(self.terms, (total_passengers, highest_latency, average_latency, total_passengers_at_vertiport, next_ground_time)):
+            term = max(slope * x + intercept, floor)
+            value = term if value is None else value + term
+        return value
+
+    def reward_ranking(self, current_time, vertiport, destination_map):
         reward_rank = {}
+        queue = vertiport.current_passengers
         for v in destination_map:
-            total_passengers = len(destination_map[v])
+            total_passengers, book_time_sum, oldest_book_time = queue.stats(v)
 
-            highest_latency = max([current_time - p.book_time for p in destination_map[v]])
-            average_latency = sum([current_time - p.book_time for p in destination_map[v]]) / len(destination_map[v])
+            # Read from the queue's running aggregates instead of walking the passengers
+            highest_latency = current_time - oldest_book_time
+            average_latency = current_time - book_time_sum / total_passengers
 
-            for vert in self.simulation.vertiports:
-                if vert.name == v:
-                    total_passengers_at_vertiport = len(vert.current_passengers)
+            total_passengers_at_vertiport = len(self.simulation.registry.get_vertiport(v).current_passengers)
 
             reward_rank[v] = self.reward_value(total_passengers, highest_latency, average_latency, total_passengers_at_vertiport, 0)
         
@@ -199,11 +199,29 @@ class RewardScheduler(Scheduler):
 
     def schedule(self, just_processed_event):
         current_time = just_processed_event.time
-
-        for vertiport in self.simulation.vertiports:
+        registry = self.simulation.registry
+
+        dirty_vertiports, dirty_aircraft = self.simulation.event_processor.take_dirty()
+        if self.incremental:
+            dirty_aircraft |= self.recheck_aircraft
+            self.recheck_aircraft = set()
+            touched = set(dirty_vertiports)
+            for aircraft in dirty_aircraft:
+                vertiport = registry.get_aircraft_vertiport(aircraft)
+                if vertiport is not None:
+                    touched.add(vertiport)
+            vertiports = sorted(touched, key=registry.position)
+        else:
+            vertiports = self.simulation.vertiports
+
+        for vertiport in vertiports:
+            replan_all = not self.incremental or vertiport in dirty_vertiports
             for aircraft in sorted(vertiport.current_aircraft, key=lambda x: x.bat_per, reverse=True):
-                destination_map = self._group_passengers_by_destination(vertiport.current_passengers)
-                ranked_routes = self.reward_ranking(current_time, destination_map)
+                if not replan_all and aircraft not in dirty_aircraft:
+                    continue
+
+                destination_map = vertiport.current_passengers.destinations()
+                ranked_routes = self.reward_ranking(current_time, vertiport, destination_map)
 
                 if not vertiport.current_passengers:
                     continue
@@ -217,26 +235,18 @@ class RewardScheduler(Scheduler):
                     continue
 
                 # Load as many passengers as we can onto the aircraft
-                loaded_passengers = []
-                passengers_for_dest.sort(key=lambda p: p.book_time)
-
-                while len(passengers_for_dest) > 0 and len(aircraft.load) < aircraft.capacity:
-                    p = passengers_for_dest.pop()
-                    success = aircraft.add_passenger(p)
-                    if success:
-                        loaded_passengers.append(p)
-                        vertiport.current_passengers.remove(p)
-                    else:
-                        # Aircraft is full or something else
-                        break
+                loaded_passengers = vertiport.current_passengers.board(chosen_destination, aircraft.capacity - len(aircraft.load))
+                for p in loaded_passengers:
+                    aircraft.add_passenger(p)
 
                 if not loaded_passengers:
-                    print("Loaded passengers fail?")
+                    if self.simulation.trace.warn:
+                        self.simulation.trace("Loaded passengers fail?")
                     continue
 
 
                 # Create a new flight event. We assume you have a class like AircraftFlight:
-                new_flight_id = generate_flight_id()
+                new_flight_id = self.simulation.context.next_flight_id()
                 departure_time = current_time + get_load_time(randomize=False)
 
                 new_flight = AircraftFlight(
@@ -257,9 +267,11 @@ class RewardScheduler(Scheduler):
             for i in range(len(ranked_routes)):
                 chosen_destination = ranked_routes[i][0]
                 if ranked_routes[i][1] <= 0:
+                    # The reward grows with waiting time, so look again next event
+                    self.recheck_aircraft.add(aircraft)
                     continue
                 passengers_for_dest = destination_map[chosen_destination]
-                if len(passengers_for_dest) < 2:
+                if len(passengers_for_dest) < self.min_group_size:
                     continue
 
 
@@ -287,11 +299,15 @@ class RewardScheduler(Scheduler):
              
             charge_time = 0
             if len(destination_map) != 0:
-                charge_time = sum(2 * len(destination_map[dest_name]) * get_transport_time(self.simulation, vertiport.name, dest_name, randomize=False) for dest_name in destination_map.keys()) / len(destination_map)
+                # One row read for every remaining destination's time
+                times = self.simulation.transport_matrix.row(vertiport.name, destination_map)
+                counts = np.fromiter((len(passengers) for passengers in destination_map.values()), dtype=float, count=len(destination_map))
+                # Summed in Python, left to right, as the per-destination loop did
+                charge_time = sum((2 * counts * times).tolist()) / len(destination_map)
             
-            charge_time = min(90, max(charge_time, 15))
+            charge_time = min(self.max_charge_time, max(charge_time, self.min_charge_time))
             if charge:
-                self.simulation.event_processor.add_charge(Charge(aircraft, charge_time))
+                self.simulation.event_processor.add_charge(Charge(aircraft, charge_time, self.simulation.context.next_charge_id()))
             return None, [], None
    
 
@@ -313,22 +329,11 @@ class RewardScheduler(Scheduler):
                 # if len(destination_map) != 0:
                     # charge_time = sum(2 * len(destination_map[dest_name]) * get_transport_time(self.simulation, vertiport.name, dest_name, randomize=False) for dest_name in destination_map.keys()) / len(destination_map)
                 
-                charge_time = min(90, max(charge_time, 15))
-                self.simulation.event_processor.add_charge(Charge(aircraft, charge_time))
+                charge_time = min(self.max_charge_time, max(charge_time, self.min_charge_time))
+                self.simulation.event_processor.add_charge(Charge(aircraft, charge_time, self.simulation.context.next_charge_id()))
                 return None, [], None     
                    
             aircraft.set_depart()
             return chosen_destination, passengers_for_dest, transport_time
             
 
-
-    def _group_passengers_by_destination(self, passengers):
-        """
-        Returns a dict: {destination_name: [list_of_passengers]}
-        """
-        destination_map = {}
-        for p in passengers:
-            if p.dest not in destination_map:
-                destination_map[p.dest] = []
-            destination_map[p.dest].append(p)
-        return destination_map
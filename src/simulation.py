@@ -1,17 +1,35 @@
 from eventprocessor import EventProcessor
 from event import Event, PassengerEvent
 from models import Aircraft, PassengerDemand, Passenger
-import random
-from vars_types import generate_passenger_id
+from context import SimulationContext
+from load_data import build_transport_matrix
+from registry import EntityRegistry
+import tracing
 
 class Simulation:
-    def __init__(self, vertiports, aircraft, passenger_demand, transport_times, ground_transport_schedule, event_create=False):
+    def __init__(self, vertiports, aircraft, passenger_demand, transport_times, ground_transport_schedule, event_create=False, transport_matrix=None, event_queue=None, tracer=None, event_log=None, context=None, seed=None):
         self.vertiports = vertiports
         self.aircraft_list = aircraft
         self.passenger_demand = passenger_demand
         self.transport_times = transport_times
+        if transport_matrix is None:
+            transport_matrix = build_transport_matrix(transport_times, vertiports)
+        self.transport_matrix = transport_matrix
+        self.registry = EntityRegistry(vertiports)
+        # Random state and ID counters of this simulation; pass a seed (or a
+        # context) to make the run reproducible
+        if context is None:
+            context = SimulationContext(seed)
+        self.context = context
         self.ground_transport_schedule = ground_transport_schedule
         self.scheduler = None 
+        self.event_queue = event_queue
+        if tracer is None:
+            tracer = tracing.tracer
+        self.trace = tracer
+        # An EventLog or a sink name from eventlog.EVENT_LOG_SINKS; batch runs
+        # can pass "memory" or "null" to keep off the disk
+        self.event_log = event_log
         if event_create:
             self.init_event_processor()
         else:
@@ -23,7 +41,8 @@ class Simulation:
             self.init_event_processor()
 
     def init_event_processor(self):
-        self.event_processor = EventProcessor(self.vertiports, self.transport_times, self.ground_transport_schedule, self.scheduler)
+        self.event_processor = EventProcessor(self.vertiports, self.transport_times, self.ground_transport_schedule, self.scheduler, self.registry, self.event_queue, self.trace, self.event_log, self.context)
+        self.event_log = self.event_processor.event_log
 
 
     def graph_passenger_demand(self):
@@ -34,11 +53,12 @@ class Simulation:
         for route in self.passenger_demand:
             for i in range(len(route.demand)):
                 demand = route.demand[i]
-                for passenger_i in range(demand):
-                    unit_time_min = (60*route.unit_time) 
-                    start_time = unit_time_min * i
-                    random_time = random.uniform(start_time, start_time + unit_time_min)
-                    passenger = Passenger(route.src, route.dest, generate_passenger_id())
+                unit_time_min = (60*route.unit_time) 
+                start_time = unit_time_min * i
+                # One draw for the whole interval's arrival times
+                random_times = self.context.rng.uniform(start_time, start_time + unit_time_min, demand).tolist()
+                for random_time in random_times:
+                    passenger = Passenger(route.src, route.dest, self.context.next_passenger_id())
 
                     passenger_event = PassengerEvent(self.event_processor.get_next_event_id(), random_time, "add_passenger_to_vertiport", passenger)
                     self.event_processor.add_passenger_event(passenger_event)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from reward import REWARD_TERMS, DEFAULT_SLOPES, DEFAULT_INTERCEPTS, DEFAULT_FLOORS, RewardCoefficients
+from replications import REPLICATION_KPIS, init_worker, run_replication
+from resultcache import DEFAULT_MAX_BYTES
+
+# Reward terms whose coefficients cannot change a decision: RewardScheduler
+# always passes 0 for next_ground_time, so its term is a constant
+FIXED_TERMS = ("next_ground_time",)
+
+# Every tunable RewardScheduler parameter and its current value. Each reward
+# term is max(slope * x + intercept, floor), see reward.py.
+SWEEP_PARAMETERS = {}
+for term, slope, intercept in zip(REWARD_TERMS, DEFAULT_SLOPES, DEFAULT_INTERCEPTS):
+    if term not in FIXED_TERMS:
+        SWEEP_PARAMETERS[term + "_slope"] = float(slope)
+        SWEEP_PARAMETERS[term + "_intercept"] = float(intercept)
+SWEEP_PARAMETERS["min_group_size"] = 2
+SWEEP_PARAMETERS["min_charge_time"] = 15.0
+SWEEP_PARAMETERS["max_charge_time"] = 90.0
+
+SEARCH_METHODS = ["grid", "random", "lhs"]
+
+# KPIs where larger is better; the rest are ranked smallest first
+MAXIMIZED_KPIS = {"throughput", "fleet_utilization"}
+
+
+def parse_parameter(spec):
+    """
+    Parses one --param spec: 'name=v1,v2,...' gives a list of values and
+    'name=low:high' a range to sample from.
+    """
+    name, _, values = spec.partition("=")
+    if name not in SWEEP_PARAMETERS:
+        raise ValueError(f"Unknown sweep parameter '{name}', expected one of {list(SWEEP_PARAMETERS)}")
+    kind = type(SWEEP_PARAMETERS[name])
+    try:
+        if ":" in values:
+            low, high = (kind(v) for v in values.split(":"))
+            return name, (low, high)
+        return name, [kind(v) for v in values.split(",")]
+    except ValueError:
+        raise ValueError(f"Bad {kind.__name__} values for sweep parameter '{name}': '{values}'") from None
+
+
+def grid_points(space):
+    """Every combination of the listed values."""
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            raise ValueError(f"Grid search needs a list of values for '{name}', got the range {values}")
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def scale(name, values, unit):
+    """Maps samples in [0, 1) onto a parameter's range or list of values."""
+    kind = type(SWEEP_PARAMETERS[name])
+    if isinstance(values, tuple):
+        low, high = values
+        if kind is int:
+            return [int(v) for v in np.floor(low + unit * (high - low + 1))]
+        return (low + unit * (high - low)).tolist()
+    return [values[i] for i in (unit * len(values)).astype(int)]
+
+
+def random_points(space, n_points, rng):
+    """Independent uniform draws from every parameter's range."""
+    columns = {name: scale(name, values, rng.random(n_points)) for name, values in space.items()}
+    return [{name: columns[name][i] for name in space} for i in range(n_points)]
+
+
+def latin_hypercube_points(space, n_points, rng):
+    """
+    Latin hypercube sample: each parameter's range is cut into n_points
+    strata and every stratum is used exactly once, in a random order per
+    parameter.
+    """
+    columns = {}
+    for name, values in space.items():
+        unit = (rng.permutation(n_points) + rng.random(n_points)) / n_points
+        columns[name] = scale(name, values, unit)
+    return [{name: columns[name][i] for name in space} for i in range(n_points)]
+
+
+def search_points(space, method="grid", n_points=20, seed=0):
+    """The sweep's points, each a full SWEEP_PARAMETERS dict."""
+    if method == "grid":
+        points = grid_points(space)
+    elif method == "random":
+        points = random_points(space, n_points, np.random.default_rng(seed))
+    elif method == "lhs":
+        points = latin_hypercube_points(space, n_points, np.random.default_rng(seed))
+    else:
+        raise ValueError(f"Unknown search method '{method}', expected one of {SEARCH_METHODS}")
+    return [{**SWEEP_PARAMETERS, **point} for point in points]
+
+
+def scheduler_kwargs(point):
+    """RewardScheduler keyword arguments for one sweep point; the fixed terms keep their default coefficients."""
+    slopes = dict(zip(REWARD_TERMS, DEFAULT_SLOPES))
+    intercepts = dict(zip(REWARD_TERMS, DEFAULT_INTERCEPTS))
+    return {
+        "coefficients": RewardCoefficients(
+            slopes=[point.get(term + "_slope", slopes[term]) for term in REWARD_TERMS],
+            intercepts=[point.get(term + "_intercept", intercepts[term]) for term in REWARD_TERMS],
+            floors=DEFAULT_FLOORS,
+        ),
+        "min_group_size": point["min_group_size"],
+        "min_charge_time": point["min_charge_time"],
+        "max_charge_time": point["max_charge_time"],
+    }
+
+
+def point_key(point, settings):
+    """Identifies a point's result: its parameters and the replication settings it was run with."""
+    text = json.dumps({"point": point, "settings": settings}, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def result_columns():
+    return (["point_key"] + list(SWEEP_PARAMETERS) + ["replications"]
+            + [f"{kpi}{suffix}" for kpi in REPLICATION_KPIS for suffix in ("", "_std")])
+
+
+def load_finished(results_file):
+    """Rows already in the results file, keyed by point_key, so an interrupted sweep can resume."""
+    if results_file is None or not os.path.exists(results_file):
+        return {}
+    finished = pd.read_csv(results_file)
+    return {row["point_key"]: row for row in finished.to_dict("records")}
+
+
+def point_result(key, point, replications):
+    # In seed order, so the means do not depend on which replication finished first
+    kpis = pd.DataFrame(replications).sort_values("seed")[REPLICATION_KPIS].astype(float)
+    row = {"point_key": key, **point, "replications": len(kpis)}
+    for kpi in REPLICATION_KPIS:
+        row[kpi] = kpis[kpi].mean()
+        row[kpi + "_std"] = kpis[kpi].std()
+    return row
+
+
+def run_sweep(data_folder, points, n_replications=10, base_seed=0, workers=None, results_file=None,
+              total_fly_time=90.0, max_event_time=20, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES):
+    """
+    Evaluates every point with the same replication seeds, spreading all
+    (point, seed) runs over one process pool. Points already in
+    results_file are skipped, and each point is appended there as soon as
+    its last replication finishes. With cache_dir, single replications
+    already run (by this or any earlier sweep) are read from the result
+    cache. Returns one row per point.
+    """
+    workers = workers or os.cpu_count()
+    settings = {"data_folder": os.path.abspath(data_folder), "replications": n_replications, "base_seed": base_seed,
+                "total_fly_time": total_fly_time, "max_event_time": max_event_time}
+    finished = load_finished(results_file)
+    keys = [point_key(point, settings) for point in points]
+    pending = {key: point for key, point in zip(keys, points) if key not in finished}
+    print(f"{len(points)} points, {len(points) - len(pending)} already done, {len(pending)} to run "
+          f"with {n_replications} replications each")
+
+    rows = dict(finished)
+    if pending:
+        new_file = results_file is not None and not os.path.exists(results_file)
+        out = open(results_file, "a", newline="") if results_file else None
+        writer = csv.DictWriter(out, fieldnames=result_columns()) if out else None
+        if new_file:
+            writer.writeheader()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data_folder, total_fly_time, cache_dir, cache_bytes)) as pool:
+                futures = {
+                    pool.submit(run_replication, seed, max_event_time, scheduler_kwargs(point)): key
+                    for key, point in pending.items()
+                    for seed in range(base_seed, base_seed + n_replications)
+                }
+                replications = {key: [] for key in pending}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    replications[key].append(future.result())
+                    if len(replications[key]) < n_replications:
+                        continue
+                    rows[key] = point_result(key, pending[key], replications.pop(key))
+                    if writer:
+                        writer.writerow(rows[key])
+                        out.flush()
+                    print(f"  {len(rows) - len(finished)}/{len(pending)} points done")
+        finally:
+            if out:
+                out.close()
+    return pd.DataFrame([rows[key] for key in keys])
+
+
+def rank_results(results, objective="mean_latency"):
+    """Sorts the points best first on the objective KPI's mean over replications."""
+    ranked = results.sort_values(objective, ascending=objective not in MAXIMIZED_KPIS, kind="stable")
+    ranked = ranked.reset_index(drop=True)
+    ranked.index = ranked.index + 1
+    ranked.index.name = "rank"
+    return ranked
+
+
+def print_ranking(ranked, space, objective, top=10):
+    columns = list(space) + [kpi for kpi in REPLICATION_KPIS if kpi != objective]
+    columns.insert(len(space), objective)
+    columns.insert(len(space) + 1, objective + "_std")
+    print(f"=== TOP {min(top, len(ranked))} OF {len(ranked)} POINTS BY {objective} ===")
+    print(ranked[columns].head(top).to_string(float_format=lambda x: f"{x:,.3f}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="Parameter Sweep",
+        description="Searches RewardScheduler's reward coefficients and thresholds, evaluating each point with replications in parallel."
+    )
+    parser.add_argument(
+        "--data-folder",
+        type=str,
+        default="../data/example_1/",
+        help="Path to the folder that contains your data."
+    )
+    parser.add_argument(
+        "--total-fly-time",
+        type=float,
+        default=90.0,
+        help="Total flight time (e.g., in minutes)."
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2,...|NAME=LOW:HIGH",
+        help=f"A parameter to sweep, as a list of values or a range (repeatable). One of: {', '.join(SWEEP_PARAMETERS)}."
+    )
+    parser.add_argument(
+        "--method",
+        choices=SEARCH_METHODS,
+        default="grid",
+        help="Grid over the listed values, or random / Latin hypercube sampling."
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=20,
+        help="Number of points drawn by random and lhs search."
+    )
+    parser.add_argument(
+        "-n", "--replications",
+        type=int,
+        default=10,
+        help="Replications per point."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the first replication (every point uses the same seeds) and of the point sampler."
+    )
+    parser.add_argument(
+        "--max-event-time",
+        type=float,
+        default=20,
+        help="Simulated hours per replication."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (defaults to the number of CPUs)."
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default="sweep_results.csv",
+        help="Results file; finished points are appended as they complete and skipped when the sweep is re-run."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Result cache directory shared with replications.py; cached replications are not re-run."
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 2**20,
+        help="Result cache size limit in MB."
+    )
+    parser.add_argument(
+        "--objective",
+        choices=REPLICATION_KPIS,
+        default="mean_latency",
+        help="KPI to rank the points by. The latency KPIs count stranded passengers with their wait up to the end of the run."
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of ranked points to print."
+    )
+    args = parser.parse_args()
+
+    try:
+        space = dict(parse_parameter(spec) for spec in args.param)
+    except ValueError as error:
+        parser.error(str(error))
+    points = search_points(space, args.method, args.points, args.seed)
+
+    print(f"Data folder location: {args.data_folder}")
+    start = time.perf_counter()
+    results = run_sweep(args.data_folder, points, args.replications, args.seed, args.workers, args.out,
+                        args.total_fly_time, args.max_event_time, args.cache_dir, args.cache_size * 2**20)
+    print(f"Sweep finished in {time.perf_counter() - start:.1f} s")
+    print_ranking(rank_results(results, args.objective), space, args.objective, args.top)
@@ -0,0 +1,42 @@
+OFF = 0
+WARN = 1
+INFO = 2
+DEBUG = 3
+
+TRACE_LEVELS = {
+    "off": OFF,
+    "warn": WARN,
+    "info": INFO,
+    "debug": DEBUG,
+}
+
+
+class Tracer:
+    """
+    Leveled trace output for the simulation core. Call sites guard on the
+    level flags before building the message:
+
+        if self.trace.debug:
+            self.trace(f"Processing {event}")
+
+    so a disabled level costs one attribute check, with no string formatting
+    or repr calls. Messages go to `out`, or to sys.stdout when it is None.
+    """
+    def __init__(self, level=DEBUG, out=None):
+        self.out = out
+        self.set_level(level)
+
+    def set_level(self, level):
+        if isinstance(level, str):
+            level = TRACE_LEVELS[level]
+        self.level = level
+        self.warn = level >= WARN
+        self.info = level >= INFO
+        self.debug = level >= DEBUG
+
+    def __call__(self, message):
+        print(message, file=self.out)
+
+
+# Shared default used by components that are not given their own tracer
+tracer = Tracer()
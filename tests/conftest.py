@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The simulation modules import each other by name from src/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from helpers import scenario_folder
+
+
+@pytest.fixture
+def large_scale():
+    """Path of the large_scale scenario folder, with the trailing separator the loaders expect."""
+    return scenario_folder("large_scale")
@@ -0,0 +1,67 @@
+"""Scenario runs and measurements shared by the tests."""
+import os
+import tracemalloc
+
+import numpy as np
+
+from eventqueue import EVENT_QUEUES
+from load_data import load_scenario
+from models import PassengerDemand
+from scheduler import RewardScheduler
+from simulation import Simulation
+from tracing import Tracer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def scenario_folder(name):
+    """Path of a scenario under data/, with the trailing separator the loaders expect."""
+    return os.path.join(ROOT, "data", name) + os.sep
+
+
+def build_simulation(data_folder, days=1, seed=0, event_log="memory", event_queue="heap", scheduler_kwargs=None):
+    """A seeded RewardScheduler simulation of the scenario, its daily demand repeated for the given number of days."""
+    scenario = load_scenario(data_folder, 90)
+    demands = [PassengerDemand(d.src, d.dest, d.unit_time, d.demand * days) for d in scenario["demands"]]
+    simulation = Simulation(scenario["vertiports"], scenario["aircraft"], demands, scenario["transports"],
+                            scenario["ground_transports"], transport_matrix=scenario["transport_matrix"],
+                            event_queue=EVENT_QUEUES[event_queue](), tracer=Tracer("off"), event_log=event_log, seed=seed)
+    simulation.add_scheduler(RewardScheduler(simulation, **(scheduler_kwargs or {})))
+    simulation.add_init_aircraft_state()
+    simulation.add_all_passenger_events()
+    return simulation
+
+
+def run_columns(data_folder, max_event_time=20, **kwargs):
+    """Typed log columns of one finished in-memory run (see build_simulation for the keyword arguments)."""
+    simulation = build_simulation(data_folder, **kwargs)
+    simulation.event_processor.run(max_event_time=max_event_time)
+    return simulation.event_log.columns()
+
+
+def unslotted(cls):
+    """A plain __dict__ class with the same __init__, i.e. the record type without __slots__."""
+    return type("Unslotted" + cls.__name__, (), {"__init__": cls.__init__})
+
+
+def traced_bytes(make, n):
+    """Traced bytes per record of n records built by make(i)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [make(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Leave out the list holding the records
+    return (after - before - records.__sizeof__()) / n
+
+
+def same_columns(a, b):
+    """True when two runs' log columns are identical, NaNs included."""
+    if a.keys() != b.keys():
+        return False
+    for name in a:
+        x, y = np.asarray(a[name]), np.asarray(b[name])
+        equal_nan = x.dtype.kind == "f" and y.dtype.kind == "f"
+        if x.shape != y.shape or not np.array_equal(x, y, equal_nan=equal_nan):
+            return False
+    return True
@@ -0,0 +1,50 @@
+from analytics import AnalyticsEngine
+from data_collector import AIRCRAFT_STATE, AircraftStatistics, PassengerLatency, StrandedPassengers
+
+
+def run(accumulator, rows):
+    engine = AnalyticsEngine()
+    engine.register(accumulator)
+    engine.run(rows)
+    return accumulator
+
+
+def test_stranded_passengers_are_counted_once():
+    rows = [
+        {"event_type": "passengerbook", "passenger_id": 1, "time": 0.0},
+        {"event_type": "passengerbook", "passenger_id": 2, "time": 0.0},
+        {"event_type": "passengerarrival", "passenger_id": 2, "time": 30.0},
+        {"event_type": "simulation_end", "end_time": 600.0},
+        {"event_type": "simulation_end", "end_time": 900.0},
+    ]
+    stranded = run(StrandedPassengers(), rows)
+    assert stranded.filtered_passengers == {1}
+
+
+def test_latencies_are_binned():
+    rows = [{"event_type": "passengerbook", "join_id": i, "time": 0.0} for i in range(4)]
+    rows += [{"event_type": "passengerdeparture", "join_id": i, "time": time}
+             for i, time in enumerate([5.0, 9.9, 10.0, 35.0])]
+    latency = run(PassengerLatency(), rows)
+    assert latency.bin_counts == {0: 2, 1: 1, 3: 1}
+    assert latency.total_latency == 59.9
+    assert list(latency.latencies) == [5.0, 9.9, 10.0, 35.0]
+
+
+def test_timelines_unpack_in_order():
+    rows = [
+        {"event_type": "aircraftinit", "aircraft_id": 7},
+        {"event_type": "aircraftdeparture", "aircraft_id": 7, "time": 10.0, "src": "A", "dest": "B"},
+        {"event_type": "aircraftarrival", "aircraft_id": 7, "time": 30.0},
+        {"event_type": "chargeevent", "aircraft_id": 7, "time": 50.0, "charge_time": 15.0},
+        {"event_type": "aircraftdeparture", "aircraft_id": 7, "time": 60.0, "src": "B", "dest": "A"},
+    ]
+    aircraft = run(AircraftStatistics(), rows)
+    aircraft.unpack_timelines()
+    assert aircraft.aircraft_map[7]["timeline"] == [
+        (10.0, AIRCRAFT_STATE.FLIGHT), (30.0, AIRCRAFT_STATE.STATIONARY), (35.0, AIRCRAFT_STATE.CHARGING),
+        (50.0, AIRCRAFT_STATE.STATIONARY), (60.0, AIRCRAFT_STATE.FLIGHT),
+    ]
+    assert aircraft.aircraft_map[7]["route"] == {10.0: ("A", "B"), 60.0: ("B", "A")}
+    charges = aircraft.aircraft_map[7]["charge_event"]
+    assert (charges.count, charges.total, charges.mean(), charges.std()) == (1, 15.0, 15.0, 0.0)
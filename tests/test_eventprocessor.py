@@ -0,0 +1,148 @@
+import tracemalloc
+
+import pytest
+
+from event import Event
+from eventprocessor import EventProcessor
+from eventlog import NullEventLog
+from eventqueue import EVENT_QUEUES
+from tracing import Tracer
+
+from helpers import build_simulation
+
+DAYS = 4
+
+
+def test_multi_day_run_does_not_grow(large_scale):
+    """Dispatched events are released, so tracked events and memory do not build up day after day."""
+    tracemalloc.start()
+    simulation = build_simulation(large_scale, DAYS, event_log="null")
+    event_processor = simulation.event_processor
+    tracked, peaks = [], []
+    process_event = event_processor.process_event
+
+    def sampled_process_event(event):
+        day = int(event_processor.current_time // (24 * 60))
+        if day >= len(tracked):
+            if tracked:
+                # Peak over the day that just ended
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            tracked.append(len(event_processor.flight_events))
+        process_event(event)
+
+    event_processor.process_event = sampled_process_event
+    try:
+        event_processor.run(max_event_time=24 * DAYS)
+    finally:
+        tracemalloc.stop()
+
+    assert len(tracked) == DAYS
+    assert all(later <= earlier for earlier, later in zip(tracked, tracked[1:])), tracked
+    assert all(peak <= peaks[0] for peak in peaks[1:]), peaks
+
+
+@pytest.fixture(params=sorted(EVENT_QUEUES))
+def processor(request):
+    return EventProcessor(event_queue=EVENT_QUEUES[request.param](), tracer=Tracer("off"), event_log="null")
+
+
+def add(processor, time, event_type="delay", data=None):
+    return processor.add_event(Event(processor.get_next_event_id(), time, event_type, data))
+
+
+def dispatch_all(processor):
+    """(time, event_id) of every event left, in dispatch order."""
+    order = []
+    while (event := processor.step()) is not None:
+        order.append((event.time, event.event_id))
+    return order
+
+
+def test_cancel(processor):
+    first = add(processor, 1.0)
+    second = add(processor, 2.0)
+
+    assert processor.cancel(first)
+    assert not processor.cancel(first)
+    assert first.event_id not in processor.flight_events
+    assert len(processor.event_queue) == 1
+    assert dispatch_all(processor) == [(2.0, second.event_id)]
+    assert processor.flight_events == {}
+
+
+def test_cancel_dispatched_event(processor):
+    event = add(processor, 1.0)
+    assert processor.step() is event
+    assert not processor.cancel(event)
+    assert not processor.cancel_event(event.event_id, event.event_type)
+
+
+def test_reschedule(processor):
+    moved = add(processor, 1.0)
+    other = add(processor, 2.0)
+
+    updated = processor.reschedule(moved, new_time=3.0, new_data="late")
+    assert updated is not moved
+    assert not moved.valid
+    assert (updated.event_id, updated.event_type, updated.time, updated.data) == (moved.event_id, "delay", 3.0, "late")
+    assert processor.flight_events[moved.event_id]["delay"] is updated
+    assert processor.reschedule(moved, new_time=4.0) is None
+    assert dispatch_all(processor) == [(2.0, other.event_id), (3.0, moved.event_id)]
+
+
+def test_modify_and_cancel_by_id(processor):
+    departure = add(processor, 1.0, "departure")
+    arrival = processor.add_event(Event(departure.event_id, 5.0, "arrival", None))
+
+    updated = processor.modify_event(departure.event_id, "departure", new_time=4.0)
+    assert updated.time == 4.0
+    assert processor.cancel_event(departure.event_id, "arrival")
+    assert not arrival.valid
+    assert processor.modify_event(departure.event_id, "arrival", new_time=6.0) is None
+    assert dispatch_all(processor) == [(4.0, departure.event_id)]
+
+
+def test_modify_dispatched_event(processor):
+    event = add(processor, 1.0)
+    later = add(processor, 2.0)
+    assert processor.step() is event
+
+    assert processor.modify_event(event.event_id, event.event_type, new_time=3.0) is None
+    assert processor.reschedule(event, new_time=3.0) is None
+    assert dispatch_all(processor) == [(2.0, later.event_id)]
+
+
+def test_cancelled_events_are_compacted(processor):
+    events = [add(processor, float(i)) for i in range(3000)]
+    for event in events[:2000]:
+        processor.cancel(event)
+
+    # Past the compaction threshold the queue is rebuilt without the cancelled events
+    assert processor.event_queue.entry_count() < 3000
+    assert len(processor.event_queue) == 1000
+    assert dispatch_all(processor) == [(event.time, event.event_id) for event in events[2000:]]
+
+
+class FailingFlushLog(NullEventLog):
+    def flush(self):
+        raise OSError("disk full")
+
+
+class FailingScheduler:
+    def schedule(self, event):
+        raise ValueError("handler failed")
+
+
+def test_flush_error_does_not_mask_a_handler_error():
+    processor = EventProcessor(scheduler=FailingScheduler(), tracer=Tracer("off"), event_log=FailingFlushLog())
+    add(processor, 1.0)
+    with pytest.raises(ValueError, match="handler failed"):
+        processor.run()
+
+
+def test_flush_error_is_raised_after_a_clean_run():
+    processor = EventProcessor(tracer=Tracer("off"), event_log=FailingFlushLog())
+    add(processor, 1.0)
+    with pytest.raises(OSError, match="disk full"):
+        processor.run()
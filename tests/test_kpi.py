@@ -0,0 +1,39 @@
+import pytest
+
+from analytics import AnalyticsEngine
+from data_collector import PassengerBookRate, PassengerLatency, PassengerThroughput, StrandedPassengers
+from eventlog import read_event_rows
+from kpi import compute_kpis
+
+from helpers import build_simulation, scenario_folder
+
+
+def streaming_kpis(log):
+    """data_collector's numbers for a log, read off the accumulators without their plots."""
+    engine = AnalyticsEngine()
+    latency = engine.register(PassengerLatency())
+    throughput = engine.register(PassengerThroughput())
+    book_rate = engine.register(PassengerBookRate())
+    stranded = engine.register(StrandedPassengers())
+    engine.run(read_event_rows(log))
+    return {
+        "passengers": latency.N,
+        "average_latency": latency.total_latency / latency.N,
+        "average_throughput": sum(throughput.per_hour_map.values()) / throughput.T,
+        "average_book_rate": sum(book_rate.per_hour_map.values()) / book_rate.T,
+        "stranded": len(stranded.stranded_passengers),
+        "long_waiting": len(stranded.filtered_passengers),
+    }
+
+
+@pytest.mark.parametrize("scenario", ["example_1", "example_2", "weekday"])
+@pytest.mark.parametrize("run_hours", [(20,), (6, 12, 20)], ids=["one_end", "three_ends"])
+def test_kpis_match_data_collector(scenario, run_hours):
+    simulation = build_simulation(scenario_folder(scenario), seed=1)
+    # Each run() call ends with a simulation_end row
+    for hours in run_hours:
+        simulation.event_processor.run(max_event_time=hours)
+
+    expected = streaming_kpis(simulation.event_log)
+    kpis = compute_kpis(simulation.event_log.columns())
+    assert {name: kpis[name] for name in expected} == expected
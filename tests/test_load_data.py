@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import load_data
+from load_data import COMPILED_SCENARIO_FILE, load_scenario, read_compiled_scenario
+
+from helpers import scenario_folder
+
+
+def plain(value):
+    """A model object graph as builtins, so two loads compare with ==."""
+    if isinstance(value, dict):
+        return {plain(k): plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return plain(value.tolist())
+    if isinstance(value, float) and np.isnan(value):
+        return "nan"
+    if hasattr(value, "__dict__"):
+        return (type(value).__name__, plain(vars(value)))
+    return value
+
+
+def copy_scenario(name, tmp_path):
+    """A copy of a scenario's files without any compiled artifact, so tests do not write into data/."""
+    path = str(tmp_path / name)
+    shutil.copytree(scenario_folder(name), path, ignore=shutil.ignore_patterns(COMPILED_SCENARIO_FILE + "*"))
+    return path
+
+
+@pytest.fixture
+def folder(tmp_path):
+    return copy_scenario("example_1", tmp_path)
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    parse_scenario = load_data.parse_scenario
+    monkeypatch.setattr(load_data, "parse_scenario", lambda *args: calls.append(args) or parse_scenario(*args))
+    return calls
+
+
+@pytest.mark.parametrize("scenario", ["example_1", "example_2", "weekday", "large_scale"])
+def test_compiled_scenario_matches_parsed(scenario, tmp_path):
+    folder = copy_scenario(scenario, tmp_path)
+    parsed = load_scenario(folder, 60, compiled=False)
+    # First load compiles, second reads the artifact
+    assert plain(load_scenario(folder, 60)) == plain(parsed)
+    assert os.path.exists(os.path.join(folder, COMPILED_SCENARIO_FILE))
+    assert plain(load_scenario(folder, 60)) == plain(parsed)
+
+
+def test_changed_file_rebuilds_the_artifact(folder, parse_calls):
+    load_scenario(folder, 60)
+    with open(os.path.join(folder, "vertiport.txt")) as f:
+        lines = f.read().splitlines()
+    name, id_str, capacity = lines[1].split(",")
+    lines[1] = f"{name},{id_str},{int(capacity) + 1}"
+    with open(os.path.join(folder, "vertiport.txt"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    scenario = load_scenario(folder, 60)
+    assert len(parse_calls) == 2
+    assert plain(scenario) == plain(load_scenario(folder, 60, compiled=False))
+    assert scenario["vertiports"][0].capacity == int(capacity) + 1
+
+
+def test_touched_file_only_refreshes_the_stamps(folder, parse_calls):
+    first = load_scenario(folder, 60)
+    path = os.path.join(folder, "passenger_demand.csv")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert plain(load_scenario(folder, 60)) == plain(first)
+    assert len(parse_calls) == 1
+    assert read_compiled_scenario(folder)["stamps"]["passenger_demand.csv"][0] == stat.st_mtime_ns + 10**9
+
+
+def test_other_schema_version_rebuilds_the_artifact(folder, parse_calls, monkeypatch):
+    load_scenario(folder, 60)
+    monkeypatch.setattr(load_data, "SCENARIO_SCHEMA_VERSION", load_data.SCENARIO_SCHEMA_VERSION + 1)
+    assert read_compiled_scenario(folder) is None
+    load_scenario(folder, 60)
+    assert len(parse_calls) == 2
+    assert read_compiled_scenario(folder)["schema"] == load_data.SCENARIO_SCHEMA_VERSION
@@ -0,0 +1,50 @@
+import hashlib
+
+import pytest
+
+import main
+from eventlog import latest_log_file
+from eventprocessor import get_log_file_path
+
+from helpers import scenario_folder
+
+
+def touch(path):
+    with open(path, "w"):
+        pass
+
+
+def digest(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def test_log_index_is_free_in_every_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert get_log_file_path() == "logged_events_0.csv"
+    touch("logged_events_0.npz")
+    assert get_log_file_path("csv") == "logged_events_1.csv"
+    assert get_log_file_path("npz") == "logged_events_1.npz"
+
+
+def test_columnar_copy_does_not_overwrite_an_earlier_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    folder = scenario_folder("example_1")
+    main.main(folder, 90.0, trace="off", event_log="npz", columnar_log="npz", seed=1, compiled_scenario=False)
+    first = digest("logged_events_0.npz")
+    main.main(folder, 90.0, trace="off", columnar_log="npz", seed=2, compiled_scenario=False)
+    assert digest("logged_events_0.npz") == first
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["logged_events_0.npz", "logged_events_1.csv", "logged_events_1.npz"]
+
+
+def test_latest_log_file_reads_any_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        latest_log_file()
+    touch("logged_events_0.csv")
+    touch("logged_events_1.npz")
+    assert latest_log_file() == "logged_events_1.npz"
+    # A run that wrote a columnar copy next to its CSV is read from the CSV
+    touch("logged_events_2.csv")
+    touch("logged_events_2.parquet")
+    assert latest_log_file() == "logged_events_2.csv"
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from models import Passenger, PassengerQueue
+
+
+class FlatQueue:
+    """The vertiport's passenger list as the schedulers used it before PassengerQueue."""
+    def __init__(self):
+        self.passengers = []
+
+    def add(self, passenger):
+        self.passengers.append(passenger)
+
+    def destinations(self):
+        destination_map = {}
+        for p in self.passengers:
+            destination_map.setdefault(p.dest, []).append(p)
+        return destination_map
+
+    def board(self, dest, k):
+        passengers_for_dest = self.destinations().get(dest, [])
+        passengers_for_dest.sort(key=lambda p: p.book_time)
+        boarded = []
+        while passengers_for_dest and len(boarded) < k:
+            p = passengers_for_dest.pop()
+            boarded.append(p)
+            self.passengers.remove(p)
+        return boarded
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_queue_matches_the_flat_list(seed):
+    rng = random.Random(seed)
+    queue, flat = PassengerQueue(), FlatQueue()
+    time = 0.0
+    for passenger_id in range(2000):
+        if rng.random() < 0.7:
+            # Several passengers can book at the same minute
+            time += rng.choice([0.0, 0.5, 1.0])
+            passenger = Passenger("A", rng.choice("BCDE"), passenger_id, book_time=time)
+            queue.add(passenger)
+            flat.add(passenger)
+        else:
+            dest, k = rng.choice("BCDE"), rng.randint(1, 4)
+            assert queue.board(dest, k) == flat.board(dest, k)
+
+        expected = flat.destinations()
+        assert list(queue.destinations()) == list(expected)
+        assert {dest: list(bucket) for dest, bucket in queue.destinations().items()} == expected
+        assert len(queue) == len(flat.passengers)
+        for dest, passengers in expected.items():
+            count, book_time_sum, oldest = queue.stats(dest)
+            assert (count, oldest) == (len(passengers), passengers[0].book_time)
+            assert book_time_sum == pytest.approx(sum(p.book_time for p in passengers))
+
+
+def test_out_of_order_booking_keeps_book_time_order():
+    queue = PassengerQueue()
+    for passenger_id, book_time in enumerate([1.0, 5.0, 3.0, 5.0, 0.5]):
+        queue.add(Passenger("A", "B", passenger_id, book_time=book_time))
+    assert [p.id for p in queue.destinations()["B"]] == [4, 0, 2, 1, 3]
+    assert queue.stats("B") == (5, 14.5, 0.5)
+    # Boarding takes the newest passengers first
+    assert [p.id for p in queue.board("B", 2)] == [3, 1]
@@ -0,0 +1,52 @@
+import pytest
+
+from event import Event, PassengerEvent, AircraftFlight, Charge
+from models import Aircraft, Passenger
+
+from helpers import traced_bytes, unslotted
+
+N_RECORDS = 5000
+
+
+@pytest.mark.parametrize("make", [
+    lambda: Passenger("A", "B", 1),
+    lambda: Event(1, 0.0, "departure", None),
+    lambda: PassengerEvent(1, 0.0, "add_passenger_to_vertiport", Passenger("A", "B", 1)),
+    lambda: AircraftFlight(1, Aircraft(1, 90, 4, "A"), "A", "B", 0.0, 20.0),
+    lambda: Charge(Aircraft(1, 90, 4, "A"), 15, 1),
+], ids=["Passenger", "Event", "PassengerEvent", "AircraftFlight", "Charge"])
+def test_records_have_no_dict(make):
+    record = make()
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.unexpected_attribute = 1
+
+
+def passenger_record(passenger_class, event_class):
+    def make(i):
+        passenger = passenger_class("A", "B", i)
+        event = event_class(i, i * 0.5, "add_passenger_to_vertiport", passenger)
+        event.passenger = passenger
+        return event
+    return make
+
+
+def flight_record(flight_class, event_class):
+    aircraft = Aircraft(1, 90, 4, "A")
+
+    def make(i):
+        flight = flight_class(i, aircraft, "A", "B", i * 0.5, 20.0)
+        return (event_class(2 * i, flight.departure_time, "departure", flight),
+                event_class(2 * i + 1, flight.arrival_time, "arrival", flight))
+    return make
+
+
+# Before __slots__ a passenger's event was a plain Event with a passenger attribute
+@pytest.mark.parametrize("record, classes, plain_classes", [
+    (passenger_record, (Passenger, PassengerEvent), (Passenger, Event)),
+    (flight_record, (AircraftFlight, Event), (AircraftFlight, Event)),
+], ids=["passenger", "flight"])
+def test_slotted_records_are_smaller(record, classes, plain_classes):
+    slotted = traced_bytes(record(*classes), N_RECORDS)
+    plain = traced_bytes(record(*(unslotted(cls) for cls in plain_classes)), N_RECORDS)
+    assert slotted < plain, (plain, slotted)
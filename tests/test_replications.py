@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpi import censored_latencies
+from replications import replication_kpis, summarize_replications, t_quantile
+
+
+def log_columns(rows):
+    """Typed columns for rows of (event type, passenger id, time, end time)."""
+    event_type, passenger_id, time, end_time = zip(*rows)
+    return {"event_type": np.array(event_type), "passenger_id": np.array(passenger_id),
+            "time": np.array(time, dtype=float), "end_time": np.array(end_time, dtype=float)}
+
+
+COLUMNS = log_columns([
+    ("passengerbook", 0, 0.0, np.nan),
+    ("passengerbook", 1, 10.0, np.nan),
+    ("passengerbook", 2, 20.0, np.nan),
+    ("passengerdeparture", 0, 30.0, np.nan),
+    ("passengerdeparture", 1, 50.0, np.nan),
+    ("simulation_end", -1, 120.0, 120.0),
+])
+
+
+def test_censored_latencies_keep_stranded_passengers():
+    # Passenger 2 never departs and waits until the end of the run
+    assert sorted(censored_latencies(COLUMNS).tolist()) == [30.0, 40.0, 100.0]
+
+
+def test_latency_kpis_count_stranded_passengers():
+    kpis = replication_kpis({**COLUMNS, "enroute_time": np.zeros(6)})
+    assert kpis["mean_latency"] == pytest.approx(170 / 3)
+    assert kpis["p95_latency"] == pytest.approx(np.percentile([30.0, 40.0, 100.0], 95))
+
+
+@pytest.mark.parametrize("df, expected", [(1, 12.706), (2, 4.303), (4, 2.776), (9, 2.262), (29, 2.045), (99, 1.984)])
+def test_t_quantile(df, expected):
+    assert t_quantile(df) == pytest.approx(expected, abs=1e-3)
+
+
+def test_confidence_interval_uses_student_t():
+    results = pd.DataFrame({"mean_latency": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    summary = summarize_replications(results, ["mean_latency"]).loc["mean_latency"]
+    half_width = 2.776 * np.std([1, 2, 3, 4, 5], ddof=1) / np.sqrt(5)
+    assert summary["ci95_high"] - summary["mean"] == pytest.approx(half_width, abs=1e-3)
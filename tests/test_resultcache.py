@@ -0,0 +1,58 @@
+import os
+import time
+
+import numpy as np
+
+from eventlog import LOG_COLUMNS
+from resultcache import PRUNE_FRACTION, STALE_TMP_AGE, ResultCache, cache_key
+
+COLUMNS = {name: np.zeros(2000) for name in LOG_COLUMNS}
+
+
+def key(seed):
+    return cache_key("scenario", "RewardScheduler", {}, seed)
+
+
+def test_put_and_get(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get(key(0)) is None
+    cache.put(key(0), {"mean_latency": 1.5}, COLUMNS)
+    kpis, columns = cache.get(key(0))
+    assert kpis == {"mean_latency": 1.5}
+    assert set(columns) >= set(LOG_COLUMNS)
+
+
+def test_workers_sharing_a_cache_stay_under_the_limit(tmp_path):
+    probe = ResultCache(str(tmp_path / "probe"))
+    probe.put(key(-1), {}, COLUMNS)
+    entry_bytes = probe.disk_usage()[0]
+
+    # Two caches on one directory stand in for two worker processes
+    max_bytes = 10 * entry_bytes
+    workers = [ResultCache(str(tmp_path / "shared"), max_bytes) for _ in range(2)]
+    for seed in range(40):
+        workers[seed % 2].put(key(seed), {}, COLUMNS)
+        size, count = workers[0].disk_usage()
+        assert size <= max_bytes, (seed, count)
+    # Entry sizes vary by a few bytes, so pruning to PRUNE_FRACTION can keep one fewer
+    assert count >= int(PRUNE_FRACTION * 10) - 1
+    # The most recent entries are the ones kept
+    assert workers[0].get(key(39), columns=False) is not None
+
+
+def test_temporary_directories_are_not_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(key(0), {}, COLUMNS)
+    shard = os.path.dirname(cache.entry_path(key(0)))
+    fresh, stale = os.path.join(shard, ".tmp-fresh"), os.path.join(shard, ".tmp-stale")
+    for path in (fresh, stale):
+        os.mkdir(path)
+        with open(os.path.join(path, "log.npz"), "wb") as f:
+            f.write(b"x" * 100)
+    old = time.time() - STALE_TMP_AGE - 60
+    os.utime(stale, (old, old))
+
+    assert [entry["key"] for entry in cache.scan()] == [key(0)]
+    assert cache.prune(max_bytes=10**9) == (0, 100)
+    assert os.path.exists(fresh) and not os.path.exists(stale)
+    assert cache.get(key(0), columns=False) is not None
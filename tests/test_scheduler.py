@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from reward import RewardCoefficients
+from scheduler import RewardScheduler
+from simulation import Simulation
+
+from helpers import run_columns, same_columns, scenario_folder
+
+
+def test_explicit_coefficients_match_the_defaults():
+    # Sweeps always pass coefficients; they must take the same scoring path
+    folder = scenario_folder("example_1")
+    default = run_columns(folder, seed=1)
+    explicit = run_columns(folder, seed=1, scheduler_kwargs={"coefficients": RewardCoefficients()})
+    assert same_columns(default, explicit)
+
+
+def test_coefficient_sets_are_rejected():
+    simulation = Simulation([], [], [], [], [])
+    coefficients = RewardCoefficients(slopes=np.ones((2, 5)))
+    with pytest.raises(ValueError, match="single coefficient set"):
+        RewardScheduler(simulation, coefficients=coefficients)
+
+
+# A negative intercept keeps rewards non-positive until passengers have waited a while,
+# so the incremental scheduler has to re-check the aircraft it skipped
+LATE_REWARD = RewardCoefficients(intercepts=[-150, -20, -2.5, 0, 20])
+
+
+@pytest.mark.parametrize("coefficients", [None, LATE_REWARD], ids=["default", "late_reward"])
+@pytest.mark.parametrize("seed", [1, 2])
+@pytest.mark.parametrize("scenario", ["example_1", "example_2", "weekday", "large_scale"])
+def test_incremental_schedule_matches_full_rescan(scenario, seed, coefficients):
+    folder = scenario_folder(scenario)
+    incremental = run_columns(folder, seed=seed, scheduler_kwargs={"coefficients": coefficients})
+    full = run_columns(folder, seed=seed, scheduler_kwargs={"coefficients": coefficients, "incremental": False})
+    assert len(full["time"]) > 0
+    assert same_columns(incremental, full)
@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from helpers import run_columns, same_columns, scenario_folder
+
+SCENARIOS = ["example_1", "example_2", "weekday", "large_scale"]
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_same_seed_gives_the_same_log(scenario):
+    folder = scenario_folder(scenario)
+    first = run_columns(folder, seed=7)
+    assert same_columns(first, run_columns(folder, seed=7))
+    assert not same_columns(first, run_columns(folder, seed=8))
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_event_queue_does_not_change_the_log(scenario):
+    folder = scenario_folder(scenario)
+    assert same_columns(run_columns(folder, seed=3, event_queue="heap"), run_columns(folder, seed=3, event_queue="calendar"))
+
+
+def test_simulations_in_threads_do_not_interfere():
+    # Each simulation owns its random generator and ID counters, so concurrent runs match solo ones
+    folder = scenario_folder("example_2")
+    seeds = [1, 2, 1, 2]
+    solo = {seed: run_columns(folder, seed=seed) for seed in set(seeds)}
+    with ThreadPoolExecutor(max_workers=len(seeds)) as pool:
+        threaded = list(pool.map(lambda seed: run_columns(folder, seed=seed), seeds))
+    for seed, columns in zip(seeds, threaded):
+        assert same_columns(columns, solo[seed])
@@ -0,0 +1,37 @@
+import pytest
+
+from reward import DEFAULT_INTERCEPTS, DEFAULT_SLOPES, REWARD_TERMS
+from sweep import FIXED_TERMS, SWEEP_PARAMETERS, parse_parameter, scheduler_kwargs, search_points
+
+from helpers import run_columns, same_columns, scenario_folder
+
+
+def test_fixed_terms_are_not_swept():
+    for term in FIXED_TERMS:
+        assert term + "_slope" not in SWEEP_PARAMETERS
+        assert term + "_intercept" not in SWEEP_PARAMETERS
+        with pytest.raises(ValueError, match="Unknown sweep parameter"):
+            parse_parameter(term + "_slope=1,2")
+
+
+def test_parse_parameter():
+    assert parse_parameter("min_group_size=1,2") == ("min_group_size", [1, 2])
+    assert parse_parameter("min_charge_time=10:20") == ("min_charge_time", (10.0, 20.0))
+    with pytest.raises(ValueError, match="min_group_size"):
+        parse_parameter("min_group_size=a")
+
+
+def test_scheduler_kwargs_keep_fixed_term_defaults():
+    point = search_points({"total_passengers_slope": [7.0]})[0]
+    coefficients = scheduler_kwargs(point)["coefficients"]
+    expected = list(DEFAULT_SLOPES)
+    expected[REWARD_TERMS.index("total_passengers")] = 7.0
+    assert coefficients.slopes.tolist() == expected
+    assert coefficients.intercepts.tolist() == list(DEFAULT_INTERCEPTS)
+
+
+def test_default_point_runs_the_default_scheduler():
+    # Sweep points rank routes on RewardScheduler's scalar reward path, like a plain run
+    folder = scenario_folder("example_2")
+    swept = run_columns(folder, seed=3, scheduler_kwargs=scheduler_kwargs(search_points({})[0]))
+    assert same_columns(run_columns(folder, seed=3), swept)